@@ -3,10 +3,13 @@ from fastapi import FastAPI, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from fastapi.middleware.cors import CORSMiddleware
+import threading
 
 # 모듈 import
 from app.modules.bedrock import call_bedrock_api
 from app.modules.crawling import get_contents
+from app.modules.url_index import url_index
+from app.modules.repository import aws
 
 
 from app.routes.news import router as news_router
@@ -14,6 +17,7 @@ from app.routes.source import router as source_router
 from app.routes.articles import router as articles_router
 from app.routes.scrap import router as scrap_router
 from app.routes.name_map import router as name_router
+from app.routes.jobs import router as jobs_router
 
 
 
@@ -25,6 +29,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],             
     allow_headers=["*"],             
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(news_router)
@@ -32,6 +37,19 @@ app.include_router(source_router)
 app.include_router(articles_router)
 app.include_router(scrap_router)
 app.include_router(name_router)
+app.include_router(jobs_router)
+
+
+@app.on_event("startup")
+def warm_url_index():
+    """URL 중복 확인용 Bloom 필터 적재 (백그라운드, 적재 전에는 DynamoDB 직접 조회)"""
+    threading.Thread(target=url_index.warm, name="url-index-warm", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def close_aws_clients():
+    """async 저장소 커넥션 정리"""
+    await aws.close()
 
 
 # -------------------------------
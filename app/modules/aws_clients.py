@@ -0,0 +1,118 @@
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+# ✅ 공통 설정 (환경변수로 변경 가능)
+AWS_REGION = os.environ.get("AWS_REGION", "us-east-1")
+AWS_MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", "64"))   # 기본값 10 → 수집/생성 스레드 수 이상
+AWS_CONNECT_TIMEOUT = float(os.environ.get("AWS_CONNECT_TIMEOUT", "3"))
+AWS_READ_TIMEOUT = float(os.environ.get("AWS_READ_TIMEOUT", "10"))
+AWS_RETRY_MODE = os.environ.get("AWS_RETRY_MODE", "standard")
+AWS_MAX_ATTEMPTS = int(os.environ.get("AWS_MAX_ATTEMPTS", "5"))
+
+
+def endpoint_url(service: str) -> Optional[str]:
+    """
+    엔드포인트 재정의 (moto / DynamoDB Local 등)
+    - AWS_ENDPOINT_URL_<SERVICE> (예: AWS_ENDPOINT_URL_DYNAMODB) → AWS_ENDPOINT_URL 순
+    """
+    key = "AWS_ENDPOINT_URL_" + service.upper().replace("-", "_")
+    return os.environ.get(key) or os.environ.get("AWS_ENDPOINT_URL") or None
+
+
+def client_config(**overrides) -> Config:
+    """공통 botocore Config (+ 서비스별 덮어쓰기, 예: retries / read_timeout)"""
+    config = Config(
+        region_name=AWS_REGION,
+        max_pool_connections=AWS_MAX_POOL_CONNECTIONS,
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+        retries={"max_attempts": AWS_MAX_ATTEMPTS, "mode": AWS_RETRY_MODE},
+    )
+    return config.merge(Config(**overrides)) if overrides else config
+
+
+def client_kwargs(service: str, **overrides) -> Dict[str, Any]:
+    """boto3 / aioboto3 client·resource 생성 인자 (같은 설정을 동기/비동기에서 공유)"""
+    return {
+        "region_name": AWS_REGION,
+        "endpoint_url": endpoint_url(service),
+        "config": client_config(**overrides),
+    }
+
+
+_session: Optional[boto3.session.Session] = None
+_cache: Dict[Tuple, Any] = {}
+_lock = threading.Lock()   # boto3 Session 은 스레드 안전하지 않으므로 생성은 락 안에서
+_generation = 0   # reset() 마다 증가 → Lazy 프록시가 다시 생성
+
+
+def _get(kind: str, service: str, overrides: Dict[str, Any]):
+    key = (kind, service, tuple(sorted((k, repr(v)) for k, v in overrides.items())))
+    obj = _cache.get(key)
+    if obj is not None:
+        return obj
+    global _session
+    with _lock:
+        obj = _cache.get(key)
+        if obj is None:
+            if _session is None:
+                _session = boto3.session.Session()
+            factory = _session.client if kind == "client" else _session.resource
+            obj = _cache[key] = factory(service, **client_kwargs(service, **overrides))
+        return obj
+
+
+def get_client(service: str, **overrides):
+    """공유 boto3 client (처음 호출 시 생성, 같은 설정이면 재사용)"""
+    return _get("client", service, overrides)
+
+
+def get_resource(service: str, **overrides):
+    """공유 boto3 resource (처음 호출 시 생성, 같은 설정이면 재사용)"""
+    return _get("resource", service, overrides)
+
+
+def reset() -> None:
+    """캐시된 client/resource 폐기 (엔드포인트 환경변수 변경 후 / 테스트용)"""
+    global _session, _generation
+    with _lock:
+        _cache.clear()
+        _session = None
+        _generation += 1
+
+
+class Lazy:
+    """
+    첫 속성 접근 시 factory() 로 실제 객체를 만들어 위임하는 프록시
+    → 모듈 전역 `article_table = lazy_table(...)` 형태를 유지하면서 import 시점에는 AWS 에 접근하지 않음
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._resolved: Tuple[int, Any] = (-1, None)
+
+    def _target(self):
+        generation, obj = self._resolved
+        if generation != _generation:
+            obj = self._factory()
+            self._resolved = (_generation, obj)
+        return obj
+
+    def __getattr__(self, name: str):
+        return getattr(self._target(), name)
+
+
+def lazy_client(service: str, **overrides) -> Lazy:
+    return Lazy(lambda: get_client(service, **overrides))
+
+
+def lazy_resource(service: str, **overrides) -> Lazy:
+    return Lazy(lambda: get_resource(service, **overrides))
+
+
+def lazy_table(name: str) -> Lazy:
+    return Lazy(lambda: get_resource("dynamodb").Table(name))
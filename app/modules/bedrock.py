@@ -1,35 +1,78 @@
-import boto3
 import json
+import os
+import random
 import re
+import time
+from botocore.exceptions import ClientError
 
-# ✅ Bedrock 클라이언트
-client = boto3.client(
-    service_name="bedrock-runtime",
-    region_name="us-east-1"
+from app.modules.aws_clients import lazy_client
+from app.modules.rate_limiter import AdaptiveRateLimiter
+
+# ✅ Bedrock 쿼터 (계정/모델별 Service Quotas 값에 맞춰 설정)
+BEDROCK_RPM = int(os.environ.get("BEDROCK_RPM", "50"))          # 분당 요청 수
+BEDROCK_TPM = int(os.environ.get("BEDROCK_TPM", "100000"))      # 분당 토큰 수 (입력 + 출력)
+BEDROCK_MAX_ATTEMPTS = 6
+MAX_TOKENS = 1000
+BEDROCK_READ_TIMEOUT = float(os.environ.get("BEDROCK_READ_TIMEOUT", "120"))   # 생성 응답은 DynamoDB 보다 훨씬 느림
+
+# ✅ Bedrock 클라이언트 (스로틀링 재시도는 아래 call_bedrock_api 에서 직접 처리)
+client = lazy_client(
+    "bedrock-runtime",
+    retries={"max_attempts": 1, "mode": "standard"},
+    read_timeout=BEDROCK_READ_TIMEOUT,
 )
 
 model_ids = {
     'haiku-3.5': 'arn:aws:bedrock:us-east-1:678005315499:inference-profile/us.anthropic.claude-3-5-haiku-20241022-v1:0'
 }
 
+limiter = AdaptiveRateLimiter(BEDROCK_RPM, BEDROCK_TPM)
+
+THROTTLE_CODES = {"ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException"}
+
+
+def estimate_tokens(prompt: str) -> int:
+    """요청 토큰 추정치 (한글 비중이 높아 글자 2개당 1토큰으로 보수적으로 계산) + 최대 출력"""
+    return len(prompt) // 2 + MAX_TOKENS
+
 
 def call_bedrock_api(prompt: str, model_name: str = 'haiku-3.5'):
     """
     Bedrock Claude 3.5 API 호출
+    - RPM/TPM 토큰 버킷으로 호출 속도 제한
+    - ThrottlingException 시 속도를 낮추고 지터 섞인 지수 백오프로 재시도
     """
-    response = client.invoke_model(
-        modelId=model_ids[model_name],
-        body=json.dumps({
-            "anthropic_version": "bedrock-2023-05-31",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 1000,
-            "temperature": 0.7,
-        }),
-        contentType="application/json",
-        accept="application/json"
-    )
-    result = json.loads(response["body"].read())
-    return result
+    estimated = estimate_tokens(prompt)
+
+    for attempt in range(BEDROCK_MAX_ATTEMPTS):
+        limiter.acquire(estimated)
+        try:
+            response = client.invoke_model(
+                modelId=model_ids[model_name],
+                body=json.dumps({
+                    "anthropic_version": "bedrock-2023-05-31",
+                    "messages": [{"role": "user", "content": prompt}],
+                    "max_tokens": MAX_TOKENS,
+                    "temperature": 0.7,
+                }),
+                contentType="application/json",
+                accept="application/json"
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in THROTTLE_CODES or attempt == BEDROCK_MAX_ATTEMPTS - 1:
+                raise
+            limiter.on_throttle()
+            delay = min(30.0, 2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"⏳ Bedrock 스로틀링 → {delay:.1f}s 후 재시도 ({attempt + 1}/{BEDROCK_MAX_ATTEMPTS})")
+            time.sleep(delay)
+            continue
+
+        limiter.on_success()
+        result = json.loads(response["body"].read())
+        usage = result.get("usage") or {}
+        if usage:
+            limiter.record_usage(estimated, usage.get("input_tokens", 0) + usage.get("output_tokens", 0))
+        return result
 
 
 def parse_bedrock_output(text: str):
@@ -41,5 +84,3 @@ def parse_bedrock_output(text: str):
     title = title_match.group(1).strip() if title_match else ""
     article = article_match.group(1).strip() if article_match else ""
     return title, article
-
-
@@ -0,0 +1,146 @@
+import asyncio
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.modules.aws_clients import lazy_client
+from app.modules.repository import ObjectStorage
+
+# zstandard 가 있으면 zstd, 없으면 zlib 로 압축 (zstd 로 저장된 본문을 읽으려면 zstandard 필요)
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+BODY_COMPRESS_MIN_BYTES = int(os.environ.get("BODY_COMPRESS_MIN_BYTES", "2048"))         # 이보다 작으면 원문 그대로
+BODY_OFFLOAD_MIN_BYTES = int(os.environ.get("BODY_OFFLOAD_MIN_BYTES", str(100 * 1024)))  # 압축 후 이보다 크면 S3 로 (아이템 한도 400KB)
+# 본문 전용 비공개 버킷 (seed.py 가 퍼블릭 액세스 차단 + 기본 암호화로 생성)
+# 썸네일 / RSS 를 서빙하는 공개 버킷에 기사 원문이 올라가지 않도록 같은 버킷은 거부
+PUBLIC_BUCKET = "sayart-news-thumbnails"
+BODY_BUCKET = os.environ.get("BODY_BUCKET", "sayart-news-bodies")
+BODY_PREFIX = "bodies"
+
+if BODY_BUCKET == PUBLIC_BUCKET:
+    raise ValueError(f"BODY_BUCKET must be a private bucket, not the public {PUBLIC_BUCKET}")
+
+ZSTD = "zstd"
+ZLIB = "zlib"
+
+_s3 = lazy_client("s3")
+_storage = ObjectStorage(BODY_BUCKET)
+
+
+def compress(data: bytes) -> Tuple[str, bytes]:
+    if HAS_ZSTD:
+        return ZSTD, zstandard.ZstdCompressor(level=3).compress(data)
+    return ZLIB, zlib.compress(data, 6)
+
+
+def decompress(encoding: str, data: bytes) -> bytes:
+    if encoding == ZSTD:
+        if not HAS_ZSTD:
+            raise RuntimeError("zstd 로 저장된 본문을 읽으려면 zstandard 패키지가 필요합니다")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if encoding == ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown body encoding: {encoding}")
+
+
+def _raw(value: Any) -> bytes:
+    """boto3 Binary / bytes → bytes"""
+    return bytes(getattr(value, "value", value))
+
+
+class BodyStore:
+    """
+    테이블 1개의 큰 본문 필드 저장 형식
+    - BODY_COMPRESS_MIN_BYTES 이상: 압축해서 Binary 로 저장 + {field}Encoding
+    - 압축 후에도 BODY_OFFLOAD_MIN_BYTES 이상: 압축본을 S3 에 올리고 {field}Ref (객체 키) 만 저장
+    - 읽기: unpack() / aunpack() 이 원래 문자열로 복원 (인코딩 속성이 없는 기존 아이템은 그대로)
+    스캔/쓰기 시 아이템 크기가 줄어 RCU/WCU 도 함께 줄어듦
+    """
+
+    def __init__(self, table_name: str, key_attr: str, fields: Iterable[str]):
+        self.table_name = table_name
+        self.key_attr = key_attr
+        self.fields = tuple(fields)
+
+    def _object_key(self, item: Dict[str, Any], field: str) -> str:
+        return f"{BODY_PREFIX}/{self.table_name}/{item[self.key_attr]}/{field}"
+
+    def projection(self, fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """ProjectionExpression 용 속성 목록 (본문 필드를 고르면 복원에 필요한 Encoding / Ref 도 포함)"""
+        if not fields:
+            return None
+        selected = list(fields)
+        for field in self.fields:
+            if field in selected:
+                selected += [f"{field}Encoding", f"{field}Ref"]
+        return selected
+
+    # ---------- 쓰기 ----------
+
+    def pack(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        저장용 아이템 (원본은 그대로 두고 복사본 반환, 블로킹: S3 업로드)
+        S3 업로드가 DynamoDB 쓰기보다 먼저 → 아이템이 있으면 본문 객체도 항상 있음
+        """
+        packed = dict(item)
+        for field in self.fields:
+            value = packed.get(field)
+            if not isinstance(value, str):
+                continue
+            data = value.encode("utf-8")
+            if len(data) < BODY_COMPRESS_MIN_BYTES:
+                continue
+            encoding, compressed = compress(data)
+            if len(compressed) >= len(data):
+                continue
+            packed[f"{field}Encoding"] = encoding
+            if len(compressed) >= BODY_OFFLOAD_MIN_BYTES:
+                key = self._object_key(item, field)
+                _s3.put_object(Bucket=BODY_BUCKET, Key=key, Body=compressed)
+                del packed[field]
+                packed[f"{field}Ref"] = key
+            else:
+                packed[field] = compressed
+        return packed
+
+    # ---------- 읽기 ----------
+
+    def _expand(self, item: Dict[str, Any], field: str, offloaded: Optional[bytes]) -> None:
+        encoding = item.pop(f"{field}Encoding", None)
+        ref = item.pop(f"{field}Ref", None)
+        data = offloaded if ref else item.get(field)
+        if encoding and data is not None:
+            item[field] = decompress(encoding, _raw(data)).decode("utf-8")
+
+    def unpack(self, item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """저장된 아이템 → 원래 본문 (블로킹: S3 다운로드)"""
+        if not item:
+            return item
+        item = dict(item)
+        for field in self.fields:
+            ref = item.get(f"{field}Ref")
+            offloaded = _s3.get_object(Bucket=BODY_BUCKET, Key=ref)["Body"].read() if ref else None
+            self._expand(item, field, offloaded)
+        return item
+
+    async def aunpack(self, item: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        if not item:
+            return item
+        item = dict(item)
+        for field in self.fields:
+            ref = item.get(f"{field}Ref")
+            offloaded = await _storage.get(ref) if ref else None
+            self._expand(item, field, offloaded)
+        return item
+
+    async def aunpack_all(self, items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """목록 복원 (S3 로 옮겨진 본문은 동시에 다운로드)"""
+        return list(await asyncio.gather(*(self.aunpack(item) for item in items)))
+
+
+article_bodies = BodyStore("ArticleTable", "articleId", ["content"])
+news_bodies = BodyStore("NewsTable", "articleId", ["description"])
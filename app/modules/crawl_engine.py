@@ -0,0 +1,64 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+from urllib.parse import urlparse
+
+DEFAULT_MAX_CONCURRENCY = 16   # 전체 동시 요청 수
+DEFAULT_PER_HOST_CONCURRENCY = 2   # 호스트별 동시 요청 수
+
+
+class CrawlEngine:
+    """
+    asyncio 기반 동시 크롤링 엔진
+    - 전체 동시 요청 수(max_concurrency, 기본 16) + 호스트별 동시 요청 수(per_host, 기본 2) 제한
+      (수집 라우트에서는 SCRAP_MAX_CONCURRENCY / SCRAP_PER_HOST_CONCURRENCY 환경변수로 지정)
+    - 블로킹 함수(extract_links, get_contents, DynamoDB 호출 등)는 전용 스레드풀(max_concurrency x 2)에서 실행
+      → fetch() 는 두 제한을 모두 적용, offload() 는 스레드풀만 사용 (DB 호출 등)
+
+    사용 예:
+        async with CrawlEngine() as engine:
+            links = await engine.fetch(url, extract_links, url, selector)
+    """
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 per_host: int = DEFAULT_PER_HOST_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        # 기본 executor는 CPU 수에 비례해 작기 때문에 동시성 상한만큼 별도 확보
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency * 2,
+            thread_name_prefix="crawl",
+        )
+
+    async def __aenter__(self) -> "CrawlEngine":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        sem = self._hosts.get(host)
+        if sem is None:
+            sem = self._hosts[host] = asyncio.Semaphore(self.per_host)
+        return sem
+
+    async def offload(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """네트워크 제한 없이 블로킹 함수를 스레드풀에서 실행 (DB 호출 등)"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def fetch(self, url: str, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        url 호스트 기준 동시성 제한을 적용해 func(*args, **kwargs) 실행
+        (호스트 슬롯 → 전체 슬롯 순으로 획득해서 대기 중인 호스트가 전체 슬롯을 점유하지 않도록 함)
+        """
+        async with self._host_semaphore(url):
+            async with self._global:
+                return await self.offload(func, *args, **kwargs)
@@ -1,23 +1,158 @@
 from bs4 import BeautifulSoup
+import functools
+import hashlib
+import os
+import re
+import time
 import requests
-from typing import List, Dict
+from contextlib import closing
+from requests.compat import chardet
+from typing import Any, Iterable, Iterator, List, Dict, Optional
 from urllib.parse import urlparse, urljoin, urlunparse
 
+from app.modules.http_transport import HttpTransport, get_transport
+
+# lxml(C 파서)이 있으면 본문 추출에 사용, 없으면 BeautifulSoup(html.parser)로 동작
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    from cssselect import HTMLTranslator, SelectorError, parse as parse_css
+    from cssselect.parser import CombinedSelector
+    from cssselect.xpath import ExpressionError
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+DROP_TAGS = frozenset({"script", "style", "noscript", "iframe"})   # 태그째 제거
+ALLOWED_ATTRS = frozenset({"href", "src", "alt"})                  # 유지할 속성
+
+MAX_PAGE_BYTES = int(os.environ.get("CRAWL_MAX_PAGE_BYTES", str(5 * 1024 * 1024)))       # 페이지 최대 크기 (data URI 제거 후 기준)
+MAX_RAW_PAGE_BYTES = int(os.environ.get("CRAWL_MAX_RAW_PAGE_BYTES", str(20 * 1024 * 1024)))  # 받은 바이트 기준 상한 (큰 data URI 포함)
+MAX_PAGE_SECONDS = float(os.environ.get("CRAWL_MAX_PAGE_SECONDS", "60"))   # 페이지 1개 다운로드 전체 시간 (read 타임아웃은 청크당)
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class PageTooLargeError(ValueError):
+    """페이지가 MAX_PAGE_BYTES / MAX_RAW_PAGE_BYTES 를 넘어서 다운로드 중단"""
+
+
+class PageTimeoutError(requests.Timeout):
+    """페이지 다운로드가 MAX_PAGE_SECONDS 를 넘어서 중단"""
+
+
+class _DataUriStripper:
+    """
+    스트리밍 중 base64 data URI(data:image/...;base64,...) 제거
+    - 청크 경계에 걸친 접두어는 다음 청크까지 보류
+    - URI 본문이 청크 끝까지 이어지면 다음 청크 앞부분의 base64 문자를 계속 버림
+    """
+
+    _DATA_URI = re.compile(rb"data:image/[\w.+-]+;base64,[A-Za-z0-9+/=]*")
+    _BASE64 = re.compile(rb"[A-Za-z0-9+/=]*")
+    _HOLD = 64   # "data:image/<mime>;base64," 접두어 보류 길이
+
+    def __init__(self):
+        self._pending = b""
+        self._in_uri = False
+
+    def feed(self, chunk: bytes) -> bytes:
+        if self._in_uri:
+            chunk = chunk[self._BASE64.match(chunk).end():]
+            if not chunk:
+                return b""
+            self._in_uri = False
+
+        buf = self._pending + chunk
+        out = []
+        pos = 0
+        for m in self._DATA_URI.finditer(buf):
+            out.append(buf[pos:m.start()])
+            pos = m.end()
+            if pos == len(buf):
+                self._pending = b""
+                self._in_uri = True
+                return b"".join(out)
+
+        keep = max(pos, len(buf) - self._HOLD)
+        out.append(buf[pos:keep])
+        self._pending = buf[keep:]
+        return b"".join(out)
+
+    def flush(self) -> bytes:
+        pending, self._pending = self._pending, b""
+        return pending
+
+
+def iter_page(response: requests.Response, max_bytes: int = MAX_PAGE_BYTES,
+              max_raw_bytes: int = MAX_RAW_PAGE_BYTES,
+              max_seconds: float = MAX_PAGE_SECONDS) -> Iterator[bytes]:
+    """
+    응답 본문을 청크 단위로 읽으면서 data URI 제거 + 크기 / 시간 제한 적용
+    - max_bytes: data URI 제거 후 크기
+    - max_raw_bytes: 받은 크기 (제거될 data URI 도 포함, max_bytes 보다 작으면 max_bytes)
+    - max_seconds: 전체 다운로드 시간 (조금씩 보내는 느린 서버 대비)
+    (중간에 순회를 멈추거나 제한에 걸리면 나머지는 다운로드하지 않음)
+    """
+    stripper = _DataUriStripper()
+    max_raw_bytes = max(max_raw_bytes, max_bytes)
+    deadline = time.monotonic() + max_seconds
+    size = raw_size = 0
+    for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+        raw_size += len(chunk)
+        if raw_size > max_raw_bytes:
+            raise PageTooLargeError(f"❌ 받은 페이지 크기가 {max_raw_bytes} bytes 를 초과했습니다. ({response.url})")
+        if time.monotonic() > deadline:
+            raise PageTimeoutError(f"❌ 페이지 다운로드가 {max_seconds}초를 초과했습니다. ({response.url})")
+        data = stripper.feed(chunk)
+        size += len(data)
+        if size > max_bytes:
+            raise PageTooLargeError(f"❌ 페이지 크기가 {max_bytes} bytes 를 초과했습니다. ({response.url})")
+        if data:
+            yield data
+    tail = stripper.flush()
+    if tail:
+        yield tail
+
+
+def _decode(response: requests.Response, raw: bytes) -> str:
+    """requests 의 response.text 와 같은 규칙으로 디코딩"""
+    encoding = response.encoding
+    if encoding is None:
+        encoding = chardet.detect(raw)["encoding"] or "utf-8"
+    try:
+        return str(raw, encoding, errors="replace")
+    except LookupError:
+        return str(raw, "utf-8", errors="replace")
+
+
+def _open(url: str, headers: Optional[Dict[str, str]] = None,
+          transport: Optional[HttpTransport] = None) -> requests.Response:
+    """본문을 읽지 않은 스트리밍 응답 열기"""
+    return (transport or get_transport()).get(url, headers=headers, stream=True)
+
+
+def download_text(url: str, headers: Optional[Dict[str, str]] = None,
+                  max_bytes: int = MAX_PAGE_BYTES,
+                  transport: Optional[HttpTransport] = None) -> str:
+    """페이지 전체를 스트리밍으로 받아 문자열로 반환 (크기 제한 / data URI 제거)"""
+    with closing(_open(url, headers, transport)) as response:
+        response.raise_for_status()
+        return _decode(response, b"".join(iter_page(response, max_bytes)))
+
+
 def clean_html(soup: BeautifulSoup) -> str:
     """
     불필요한 속성(style, class, id 등) 제거 후 HTML 문자열로 반환
     """
     # 1️⃣ 불필요한 태그 자체 제거
-    for tag in soup(["script", "style", "noscript", "iframe"]):
+    for tag in soup(list(DROP_TAGS)):
         tag.decompose()
 
     # 2️⃣ 각 태그의 불필요한 속성 제거
     for tag in soup.find_all(True):  # True → 모든 태그
-        allowed_attrs = {"href", "src", "alt"}  # 유지할 속성
-        attrs = dict(tag.attrs)
-        for attr in list(attrs.keys()):
-            if attr not in allowed_attrs:
-                del tag.attrs[attr]
+        for attr in [a for a in tag.attrs if a not in ALLOWED_ATTRS]:
+            del tag.attrs[attr]
 
     # 3️⃣ 정돈된 HTML 반환
     return str(soup)
@@ -66,23 +201,8 @@ def normalize_url(base_url: str, link: str) -> str:
     return normalized
 
 
-def extract_links(url: str, selector: str, tag: str = "a", attr: str = "href") -> List[str]:
-    """
-    주어진 URL에서 특정 selector 하위의 tag에서 attr 속성들을 추출
-    
-    Args:
-        url (str): 크롤링할 페이지 URL
-        selector (str): CSS selector (예: "div.company-news", "div.news-list")
-        tag (str): 추출할 태그 이름 (기본값 "a")
-        attr (str): 추출할 속성 (기본값 "href")
-    
-    Returns:
-        List[str]: 추출된 (정규화된) URL 리스트
-    """
-    response = requests.get(url)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
-
+def _links_from_soup(soup: BeautifulSoup, url: str, selector: str, tag: str, attr: str) -> List[str]:
+    """파싱된 목록 페이지에서 selector 하위 tag의 attr 값을 정규화해서 반환"""
     elements = soup.select(selector + f" {tag}")
     if not elements:
         raise ValueError(f"❌ extract_links: '{selector} {tag}' selector로 매칭된 요소가 없습니다. ({url})")
@@ -101,17 +221,96 @@ def extract_links(url: str, selector: str, tag: str = "a", attr: str = "href") -
     return list(set(results))  # ✅ 중복 제거
 
 
-def get_contents(url: str, selector: str) -> Dict[str, List[Dict[str, str]]]:
+def extract_links(url: str, selector: str, tag: str = "a", attr: str = "href",
+                  transport: Optional[HttpTransport] = None,
+                  max_bytes: int = MAX_PAGE_BYTES) -> List[str]:
     """
-    지정된 CSS selector로 본문(html + 이미지) 추출 (스타일 제거 버전)
+    주어진 URL에서 특정 selector 하위의 tag에서 attr 속성들을 추출
+    
+    Args:
+        url (str): 크롤링할 페이지 URL
+        selector (str): CSS selector (예: "div.company-news", "div.news-list")
+        tag (str): 추출할 태그 이름 (기본값 "a")
+        attr (str): 추출할 속성 (기본값 "href")
+        transport (HttpTransport): HTTP 전송 객체 (기본값: 공용 전송 객체)
+        max_bytes (int): 페이지 최대 크기
+    
+    Returns:
+        List[str]: 추출된 (정규화된) URL 리스트
+    """
+    text = download_text(url, max_bytes=max_bytes, transport=transport)
+    soup = BeautifulSoup(text, "html.parser")
+    return _links_from_soup(soup, url, selector, tag, attr)
+
+
+def listing_fingerprint(soup: BeautifulSoup, selector: str, tag: str, attr: str) -> str:
+    """
+    목록 영역(selector) HTML 해시
+    - selector/tag/attr 도 함께 해시해서 수집 설정이 바뀌면 지문도 달라지도록 함
+    """
+    h = hashlib.sha256(f"{selector}|{tag}|{attr}".encode("utf-8"))
+    for container in soup.select(selector):
+        h.update(str(container).encode("utf-8"))
+    return h.hexdigest()
+
+
+def fetch_listing(url: str, selector: str, tag: str = "a", attr: str = "href",
+                  etag: Optional[str] = None, last_modified: Optional[str] = None,
+                  fingerprint: Optional[str] = None,
+                  transport: Optional[HttpTransport] = None,
+                  max_bytes: int = MAX_PAGE_BYTES) -> Dict[str, Any]:
     """
-    response = requests.get(url)
-    response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
+    조건부 요청(If-None-Match / If-Modified-Since)으로 목록 페이지를 확인하고
+    변경된 경우에만 링크 추출
+
+    Returns:
+        {
+            "status": "not_modified"(304) | "unchanged"(목록 영역 동일) | "changed",
+            "links": 추출된 링크 (changed 일 때만),
+            "etag", "lastModified", "fingerprint": 다음 요청에 사용할 값
+        }
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    with closing(_open(url, headers, transport)) as response:
+        if response.status_code == 304:
+            return {
+                "status": "not_modified",
+                "links": [],
+                "etag": etag,
+                "lastModified": last_modified,
+                "fingerprint": fingerprint,
+            }
+        response.raise_for_status()
+        text = _decode(response, b"".join(iter_page(response, max_bytes)))
+    soup = BeautifulSoup(text, "html.parser")
+
+    result = {
+        "status": "changed",
+        "links": [],
+        "etag": response.headers.get("ETag"),
+        "lastModified": response.headers.get("Last-Modified"),
+        "fingerprint": listing_fingerprint(soup, selector, tag, attr),
+    }
+    if fingerprint and result["fingerprint"] == fingerprint:
+        result["status"] = "unchanged"
+        return result
+
+    result["links"] = _links_from_soup(soup, url, selector, tag, attr)
+    return result
+
+
+def _extract_sections_bs4(text: str, selector: str) -> Optional[tuple]:
+    """BeautifulSoup 경로: (섹션 HTML 목록, 이미지 목록), selector 미매칭 시 None"""
+    soup = BeautifulSoup(text, "html.parser")
 
     sections = soup.select(selector)
     if not sections:
-        raise ValueError(f"❌ get_contents: selector '{selector}' 로 매칭된 요소가 없습니다. ({url})")
+        return None
 
     all_texts, all_images = [], []
 
@@ -127,8 +326,163 @@ def get_contents(url: str, selector: str) -> Dict[str, List[Dict[str, str]]]:
         if clean_section_html.strip():
             all_texts.append(clean_section_html)
 
+    return all_texts, all_images
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_selector(selector: str):
+    """CSS selector → XPath 컴파일 결과 캐시 (lxml 미지원 selector면 None)"""
+    try:
+        return CSSSelector(selector, translator="html")
+    except (SelectorError, ExpressionError):
+        return None
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_subject(selector: str):
+    """
+    selector 의 마지막 단순 selector(대상 요소)만 self:: XPath로 컴파일
+    - 스트리밍 중 닫힌 요소가 대상 후보인지 빠르게 거르는 용도
+    - 그룹(,) selector 나 변환 불가 selector면 None
+    """
+    try:
+        selectors = parse_css(selector)
+        if len(selectors) != 1:
+            return None
+        tree = selectors[0].parsed_tree
+        while isinstance(tree, CombinedSelector):
+            tree = tree.subselector
+        return etree.XPath("self::" + str(HTMLTranslator().xpath(tree)))
+    except (SelectorError, ExpressionError, etree.XPathError):
+        return None
+
+
+def _extract_sections_from_root(root, match) -> Optional[tuple]:
+    """
+    lxml 경로: selector 하위 트리만 한 번 순회하면서
+    이미지 수집 + 불필요 태그 표시 + 속성 제거를 동시에 처리
+    """
+    sections = match(root)
+    if not sections:
+        return None
+
+    all_texts, all_images = [], []
+
+    for section in sections:
+        dropped = []
+        for el in section.iter():
+            tag = el.tag
+            if not isinstance(tag, str):   # 주석 등
+                continue
+            if tag == "img":
+                all_images.append({"src": el.get("src"), "alt": el.get("alt", "")})
+            if tag in DROP_TAGS:
+                dropped.append(el)
+            if el is section:   # 기존 동작과 동일하게 섹션 자신의 속성은 유지
+                continue
+            attrib = el.attrib
+            for attr in [a for a in attrib if a not in ALLOWED_ATTRS]:
+                del attrib[attr]
+
+        for el in dropped:
+            el.drop_tree()
+
+        clean_section_html = lxml.html.tostring(section, encoding="unicode", with_tail=False)
+        if clean_section_html.strip():
+            all_texts.append(clean_section_html)
+
+    return all_texts, all_images
+
+
+def _extract_sections_lxml(text: str, selector: str) -> Optional[tuple]:
+    match = _compile_selector(selector)
+    if match is None:
+        return _extract_sections_bs4(text, selector)
+
+    # <?xml encoding=...?> 선언이 있는 문자열도 처리되도록 UTF-8 바이트로 파싱
+    parser = lxml.html.HTMLParser(encoding="utf-8")
+    root = lxml.html.fromstring(text.encode("utf-8"), parser=parser)
+    return _extract_sections_from_root(root, match)
+
+
+def _parse_until_closed(chunks: Iterable[bytes], match, subject, encoding: Optional[str]):
+    """
+    청크를 점진적으로 파싱하다가 selector 대상 요소가 닫히면 다운로드 중단
+    Returns: 지금까지 파싱된 문서 root
+    """
+    parser = etree.HTMLPullParser(events=("end",), encoding=encoding)
+    parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())   # drop_tree() 등 HtmlElement 기능 사용
+    for chunk in chunks:
+        parser.feed(chunk)
+        for _, el in parser.read_events():
+            if subject(el) and el in match(el.getroottree().getroot()):
+                return parser.close()
+    return parser.close()
+
+
+def _render(extracted: Optional[tuple], selector: str, url: str) -> Dict[str, List[Dict[str, str]]]:
+    if extracted is None:
+        raise ValueError(f"❌ get_contents: selector '{selector}' 로 매칭된 요소가 없습니다. ({url})")
+
+    all_texts, all_images = extracted
     text_with_tags = "\n".join(all_texts).strip()
     if not text_with_tags:
         raise ValueError(f"❌ get_contents: selector '{selector}' 내부에서 본문 텍스트를 추출하지 못했습니다. ({url})")
 
-    return {"html": text_with_tags, "images": all_images}
\ No newline at end of file
+    return {"html": text_with_tags, "images": all_images}
+
+
+def extract_contents(text: str, selector: str, url: str = "",
+                     engine: Optional[str] = None) -> Dict[str, List[Dict[str, str]]]:
+    """
+    HTML 문자열에서 selector 본문(html + 이미지) 추출
+
+    Args:
+        engine (str): "lxml" | "bs4" (기본값: lxml 설치 시 lxml)
+
+    두 엔진의 출력 차이 (lxml 6.1.3 / bs4 html.parser 기준):
+    - void 요소 직렬화: <input> / <br> (lxml) vs <input/> / <br/> (bs4)
+    - 닫히지 않은 <p>, <li>: lxml 은 HTML 규칙대로 닫고 형제로 두지만 html.parser 는 중첩시킴
+    텍스트 / 이미지 목록은 동일
+    """
+    if engine is None:
+        engine = "lxml" if HAS_LXML else "bs4"
+
+    if engine == "lxml":
+        extracted = _extract_sections_lxml(text, selector)
+    else:
+        extracted = _extract_sections_bs4(text, selector)
+
+    return _render(extracted, selector, url)
+
+
+def get_contents(url: str, selector: str,
+                 transport: Optional[HttpTransport] = None,
+                 max_bytes: int = MAX_PAGE_BYTES,
+                 early_stop: bool = False) -> Dict[str, List[Dict[str, str]]]:
+    """
+    지정된 CSS selector로 본문(html + 이미지) 추출 (스타일 제거 버전)
+
+    Args:
+        max_bytes (int): 페이지 최대 크기 (초과 시 PageTooLargeError)
+        early_stop (bool): selector 의 첫 요소가 닫히면 나머지 페이지는 받지 않음
+                           (본문 요소가 하나뿐인 수집처용, lxml 필요)
+    """
+    match = _compile_selector(selector) if HAS_LXML else None
+    subject = _compile_subject(selector) if early_stop and match is not None else None
+
+    with closing(_open(url, transport=transport)) as response:
+        response.raise_for_status()
+        chunks = iter_page(response, max_bytes)
+
+        if subject is None:
+            text = _decode(response, b"".join(chunks))
+        else:
+            # Content-Type 에 charset 이 명시된 경우만 지정, 아니면 <meta charset> 감지
+            content_type = response.headers.get("Content-Type", "").lower()
+            encoding = response.encoding if "charset" in content_type else None
+            root = _parse_until_closed(chunks, match, subject, encoding)
+
+    if subject is None:
+        return extract_contents(text, selector, url)
+    return _render(_extract_sections_from_root(root, match), selector, url)
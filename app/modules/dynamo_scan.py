@@ -0,0 +1,117 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+_DONE = object()   # 세그먼트 종료 표시
+
+
+def projection_kwargs(fields: Union[str, Iterable[str], None],
+                      names: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    속성 목록 → ProjectionExpression + ExpressionAttributeNames
+    (date, name 같은 예약어도 안전하도록 항상 #p0, #p1 ... 별칭 사용)
+    """
+    if not fields:
+        return {}
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+    names = dict(names or {})
+    aliases = []
+    for i, field in enumerate(dict.fromkeys(fields)):
+        alias = f"#p{i}"
+        names[alias] = field
+        aliases.append(alias)
+    return {"ProjectionExpression": ", ".join(aliases), "ExpressionAttributeNames": names}
+
+
+def select_fields(fields: Optional[str], view: Optional[str],
+                  summary: Sequence[str], keys: Sequence[str] = ()) -> Optional[List[str]]:
+    """
+    목록 API 의 fields= / view= 파라미터 → 가져올 속성 목록 (None 이면 전체)
+    - fields="a,b": 지정한 속성 + 키 속성
+    - view="summary": 목록 화면용 속성만 (summary)
+    """
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        return list(dict.fromkeys([*keys, *selected])) if selected else None
+    if view == "summary":
+        return list(summary)
+    return None
+
+
+def _scan_pages(table, kwargs: Dict[str, Any]) -> Iterator[list]:
+    """LastEvaluatedKey 를 따라가며 페이지(1MB) 단위로 반환"""
+    while True:
+        res = table.scan(**kwargs)
+        yield res.get("Items", [])
+        last_key = res.get("LastEvaluatedKey")
+        if not last_key:
+            return
+        kwargs = {**kwargs, "ExclusiveStartKey": last_key}
+
+
+def _put(out: queue.Queue, value: Any, stop: threading.Event) -> None:
+    while not stop.is_set():
+        try:
+            out.put(value, timeout=0.2)
+            return
+        except queue.Full:
+            continue
+
+
+def _scan_segment(table, kwargs: Dict[str, Any], out: queue.Queue, stop: threading.Event) -> None:
+    try:
+        for page in _scan_pages(table, kwargs):
+            if stop.is_set():
+                return
+            _put(out, page, stop)
+    except Exception as e:
+        _put(out, e, stop)
+    finally:
+        _put(out, _DONE, stop)
+
+
+def scan_all(table, segments: int = 1,
+             projection: Union[str, Iterable[str], None] = None,
+             **scan_kwargs) -> Iterator[dict]:
+    """
+    DynamoDB 전체 스캔 제너레이터
+    - LastEvaluatedKey 페이지네이션 처리 (1MB 첫 페이지에서 잘리지 않음)
+    - segments > 1 이면 Segment/TotalSegments 병렬 스캔 (세그먼트별 스레드)
+    - projection: 가져올 속성 목록 (ProjectionExpression)
+    - 페이지 단위로 흘려보내므로 메모리는 (세그먼트 수 x 2) 페이지 이내로 유지
+
+    사용 예:
+        for item in scan_all(news_table, segments=4, projection=["articleId", "pubDate"]):
+            ...
+    """
+    kwargs = dict(scan_kwargs)
+    if projection:
+        kwargs.update(projection_kwargs(projection, kwargs.get("ExpressionAttributeNames")))
+
+    if segments <= 1:
+        for page in _scan_pages(table, kwargs):
+            yield from page
+        return
+
+    out: queue.Queue = queue.Queue(maxsize=segments * 2)
+    stop = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=segments, thread_name_prefix="scan")
+    try:
+        for segment in range(segments):
+            pool.submit(_scan_segment, table,
+                        {**kwargs, "Segment": segment, "TotalSegments": segments}, out, stop)
+        finished = 0
+        while finished < segments:
+            page = out.get()
+            if page is _DONE:
+                finished += 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        # 소비자가 중간에 멈추거나 오류가 나면 남은 세그먼트 중단
+        stop.set()
+        pool.shutdown(wait=False)
@@ -0,0 +1,137 @@
+import hashlib
+import html
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Tuple
+
+from app.modules.aws_clients import lazy_table
+
+GENERATION_CACHE_TABLE = "GenerationCacheTable"   # PK: cacheKey, TTL 속성: expiresAt
+CACHE_TTL_SECONDS = 7 * 24 * 3600
+CACHE_MAX_ENTRIES = 1024
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_content(content: str) -> str:
+    """태그/엔티티/공백 차이를 없앤 본문 텍스트 (같은 보도자료가 다른 마크업으로 올라와도 같은 값)"""
+    text = html.unescape(_TAG_RE.sub(" ", content or ""))
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def version_of(text: str) -> str:
+    """템플릿/네임맵 원문 → 짧은 버전 해시"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+
+def make_cache_key(content: str, template_version: str, name_map_version: str) -> str:
+    h = hashlib.sha256()
+    for part in (normalize_content(content), template_version, name_map_version):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class GenerationCache:
+    """
+    생성 결과(title, description) 캐시
+    - 1차: 프로세스 내 LRU + TTL
+    - 2차: DynamoDB (인스턴스 간 공유 / 재시작 후에도 유지, 만료는 DynamoDB TTL)
+    - get_or_create(): 같은 키의 생성은 프로세스 내에서 1번만 (동시에 들어온 중복 본문은 첫 결과를 기다림)
+    저장소 오류는 캐시 미스로 처리 (생성 자체는 막지 않음)
+    """
+
+    def __init__(self, table, max_entries: int = CACHE_MAX_ENTRIES, ttl_seconds: int = CACHE_TTL_SECONDS):
+        self.table = table
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, list] = {}   # key → [생성 락, 대기 수]
+
+    def _remember(self, key: str, value: Dict[str, str], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _local(self, key: str, now: float) -> Optional[Dict[str, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    return entry[1]
+                del self._entries[key]
+        return None
+
+    def get(self, key: str) -> Optional[Dict[str, str]]:
+        now = time.time()
+        value = self._local(key, now)
+        if value is not None:
+            return value
+
+        try:
+            item = self.table.get_item(Key={"cacheKey": key}).get("Item")
+        except Exception as e:
+            print(f"⚠️ 생성 캐시 조회 실패: {e}")
+            return None
+        # DynamoDB TTL 삭제는 지연될 수 있으므로 만료 여부 직접 확인
+        if not item or int(item.get("expiresAt", 0)) <= now:
+            return None
+
+        value = {"title": item["title"], "description": item["description"]}
+        self._remember(key, value, float(item["expiresAt"]))
+        return value
+
+    def put(self, key: str, title: str, description: str) -> None:
+        expires_at = int(time.time() + self.ttl_seconds)
+        value = {"title": title, "description": description}
+        self._remember(key, value, expires_at)
+        try:
+            self.table.put_item(Item={"cacheKey": key, **value, "expiresAt": expires_at})
+        except Exception as e:
+            print(f"⚠️ 생성 캐시 저장 실패: {e}")
+
+
+    @contextmanager
+    def _key_lock(self, key: str) -> Iterator[None]:
+        with self._lock:
+            entry = self._inflight.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._inflight[key]
+
+    def get_or_create(self, key: str,
+                      create: Callable[[], Tuple[str, str]]) -> Tuple[Dict[str, str], bool]:
+        """
+        캐시 조회 → 없으면 create() 로 (title, description) 생성 후 저장
+        같은 키로 동시에 호출되면 첫 호출만 생성하고 나머지는 그 결과를 사용
+        (첫 호출이 실패하면 다음 대기자가 생성 시도)
+        Returns: (값, 캐시 사용 여부)
+        """
+        value = self.get(key)
+        if value is not None:
+            return value, True
+        with self._key_lock(key):
+            # 기다리는 동안 앞선 호출이 저장했으면 그 결과 사용
+            value = self._local(key, time.time())
+            if value is not None:
+                return value, True
+            title, description = create()
+            self.put(key, title, description)
+            return {"title": title, "description": description}, False
+
+
+generation_cache = GenerationCache(lazy_table(GENERATION_CACHE_TABLE))
@@ -0,0 +1,100 @@
+import os
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+DEFAULT_TIMEOUT = (5.0, 20.0)   # (connect, read) 초
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5           # 0.5s, 1s, 2s ... + jitter
+DEFAULT_BACKOFF_JITTER = 0.5
+# 서버의 Retry-After 를 따르되 시도당 이 값(초)까지만 대기 (urllib3 기본 6시간 → 느린 사이트가 수집 슬롯을 붙잡음)
+DEFAULT_RETRY_AFTER_MAX = int(os.environ.get("CRAWL_RETRY_AFTER_MAX", "30"))
+DEFAULT_MAX_HOSTS = 64          # 호스트별 커넥션 풀 캐시 수
+DEFAULT_POOL_PER_HOST = 8       # 호스트별 keep-alive 커넥션 수
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+
+class HttpTransport:
+    """
+    크롤링 공용 HTTP 전송 계층
+    - requests.Session 기반 커넥션 풀링 / keep-alive 재사용
+    - gzip/deflate(+br: brotli 설치 시) 압축 응답 자동 해제
+    - connect/read 타임아웃 기본 적용
+    - 연결 오류 / 429 / 5xx 에 대해 지터가 섞인 지수 백오프 재시도 (GET/HEAD만)
+      Retry-After 는 retry_after_max 초까지만 따름
+    """
+
+    def __init__(self,
+                 timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF,
+                 backoff_jitter: float = DEFAULT_BACKOFF_JITTER,
+                 retry_after_max: int = DEFAULT_RETRY_AFTER_MAX,
+                 max_hosts: int = DEFAULT_MAX_HOSTS,
+                 pool_per_host: int = DEFAULT_POOL_PER_HOST,
+                 headers: Optional[Dict[str, str]] = None,
+                 session: Optional[requests.Session] = None):
+        self.timeout = timeout
+        self.session = session or requests.Session()
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            backoff_jitter=backoff_jitter,
+            status_forcelist=RETRY_STATUS,
+            allowed_methods=frozenset({"GET", "HEAD"}),
+            respect_retry_after_header=True,
+            retry_after_max=retry_after_max,
+            raise_on_status=False,   # 마지막 응답을 그대로 돌려주고 raise_for_status()에 맡김
+        )
+        adapter = HTTPAdapter(
+            pool_connections=max_hosts,
+            pool_maxsize=pool_per_host,
+            max_retries=retry,
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # 실제로 해제 가능한 인코딩만 광고 (brotli 미설치 시 br 제외)
+        self.session.headers.update(make_headers(accept_encoding=True))
+        if headers:
+            self.session.headers.update(headers)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.get(url, headers=headers, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_default_transport: Optional[HttpTransport] = None
+_default_lock = threading.Lock()
+
+
+def get_transport() -> HttpTransport:
+    """기본 전송 객체 (최초 사용 시 생성)"""
+    global _default_transport
+    if _default_transport is None:
+        with _default_lock:
+            if _default_transport is None:
+                _default_transport = HttpTransport()
+    return _default_transport
+
+
+def set_transport(transport: Optional[HttpTransport]) -> None:
+    """
+    기본 전송 객체 교체 (테스트용 로컬 서버 / 프록시 세션 등 주입)
+    None 을 넘기면 다음 사용 시 기본 설정으로 다시 생성
+    """
+    global _default_transport
+    with _default_lock:
+        previous, _default_transport = _default_transport, transport
+    if previous is not None and previous is not transport:
+        previous.close()
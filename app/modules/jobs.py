@@ -0,0 +1,390 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+from app.modules.leases import NODE_ID, SCRAP_LEASE_TABLE, Lease, LeaseManager
+from app.modules.repository import TableRepository
+
+JOB_MAX_RUNNING = int(os.environ.get("JOB_MAX_RUNNING", "2"))        # 동시에 실행할 작업 수
+JOB_HISTORY_LIMIT = int(os.environ.get("JOB_HISTORY_LIMIT", "200"))  # 메모리에 보관할 완료 작업 수
+
+JOB_TABLE = "JobTable"   # PK: jobId, TTL 속성: expiresAt
+JOB_TTL_SECONDS = int(os.environ.get("JOB_TTL_SECONDS", str(7 * 24 * 3600)))
+JOB_SYNC_SECONDS = float(os.environ.get("JOB_SYNC_SECONDS", "2"))   # 진행 상황 저장 / 원격 취소 확인 주기
+JOB_RECORD_MAX_BYTES = 300 * 1024   # items / result JSON 이 이보다 크면 저장 생략 (아이템 한도 400KB)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = {SUCCEEDED, FAILED, CANCELLED}
+
+# submit(exclusive=...) 범위
+INSTANCE = "instance"   # 이 인스턴스에서 종류별 1개 (다른 인스턴스와는 리소스 단위 리스로 나눔)
+CLUSTER = "cluster"     # 종류별 리스(job#{kind})로 인스턴스 전체에서 1개
+
+
+class JobCancelled(Exception):
+    """작업 취소 요청 (스레드에서 실행되는 코드가 중단 지점에서 발생시킴)"""
+
+
+class JobConflict(Exception):
+    """같은 종류의 작업이 이미 대기/실행 중 (다른 인스턴스 포함)"""
+
+    def __init__(self, kind: str, job_id: Optional[str] = None):
+        super().__init__(kind)
+        self.kind = kind
+        self.job_id = job_id
+
+
+def _dump(value: Any) -> Optional[str]:
+    """items / result → JSON 문자열 (너무 크면 None)"""
+    data = json.dumps(value, ensure_ascii=False, default=str)
+    return data if len(data.encode("utf-8")) <= JOB_RECORD_MAX_BYTES else None
+
+
+class Job:
+    """
+    백그라운드 작업 1건의 상태 / 진행 카운터
+    - totals: 전체 합계 (new / skipped / failed ...)
+    - items: 수집처·기사별 카운터와 상태
+    - 카운터 갱신은 이벤트 루프 / 워커 스레드 어디서 호출해도 안전
+    """
+
+    def __init__(self, kind: str, params: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.params = dict(params or {})
+        self.status = QUEUED
+        self.created_at = datetime.utcnow().isoformat()
+        self.started_at: Optional[str] = None
+        self.finished_at: Optional[str] = None
+        self.totals: Dict[str, int] = {}
+        self.items: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self._cancel = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+
+    # ---------- 진행 상황 ----------
+
+    def bump(self, key: Optional[str] = None, field: str = "processed", n: int = 1) -> None:
+        """totals[field] (+ items[key][field]) 를 n 만큼 증가"""
+        with self._lock:
+            self.totals[field] = self.totals.get(field, 0) + n
+            if key is not None:
+                item = self.items.setdefault(key, {})
+                item[field] = item.get(field, 0) + n
+
+    def update_item(self, key: str, **fields) -> None:
+        """items[key] 의 상태 필드 갱신 (이름, status 등)"""
+        with self._lock:
+            self.items.setdefault(key, {}).update(fields)
+
+    # ---------- 취소 ----------
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check_cancelled(self) -> None:
+        """스레드에서 실행되는 루프의 중단 지점"""
+        if self._cancel.is_set():
+            raise JobCancelled(self.id)
+
+    def to_dict(self, include_items: bool = True) -> Dict[str, Any]:
+        with self._lock:
+            data = {
+                "jobId": self.id,
+                "kind": self.kind,
+                "status": self.status,
+                "params": self.params,
+                "createdAt": self.created_at,
+                "startedAt": self.started_at,
+                "finishedAt": self.finished_at,
+                "cancelRequested": self.cancelled,
+                "totals": dict(self.totals),
+                "error": self.error,
+            }
+            if include_items:
+                data["items"] = {k: dict(v) for k, v in self.items.items()}
+                data["result"] = self.result
+            return data
+
+
+class JobStore:
+    """
+    작업 상태 공유 저장소 (DynamoDB JobTable, 만료는 DynamoDB TTL)
+    → 요청이 어느 인스턴스로 가도 상태 조회 / 취소 가능
+    items / result 는 JSON 문자열로 저장 (JOB_RECORD_MAX_BYTES 초과 시 생략)
+    """
+
+    def __init__(self, table: TableRepository, ttl_seconds: int = JOB_TTL_SECONDS):
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+
+    async def save(self, job: Job, include_items: bool = False) -> bool:
+        """
+        현재 상태 기록 (cancelRequested 는 건드리지 않음)
+        - 주기 저장은 상태 / 합계만, include_items=True (종료 시) 면 items / result 까지
+        Returns: 다른 인스턴스에서 취소가 요청됐는지
+        """
+        data = job.to_dict(include_items)
+        fields = {
+            "kind": data["kind"],
+            "status": data["status"],
+            "params": data["params"],
+            "createdAt": data["createdAt"],
+            "startedAt": data["startedAt"],
+            "finishedAt": data["finishedAt"],
+            "totals": data["totals"],
+            "error": data["error"],
+            "owner": NODE_ID,
+            "expiresAt": int(time.time()) + self.ttl_seconds,
+        }
+        if include_items:
+            fields["items"] = _dump(data["items"])
+            fields["result"] = _dump(data["result"])
+        names = {f"#j{i}": k for i, k in enumerate(fields)}
+        values = {f":j{i}": v for i, v in enumerate(fields.values())}
+        res = await self.table.update(
+            {"jobId": job.id},
+            UpdateExpression="SET " + ", ".join(f"{alias} = :j{i}" for i, alias in enumerate(names)),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
+            ReturnValues="ALL_OLD",   # 이전 아이템의 cancelRequested 확인 (items 는 종료 시에만 기록되므로 작음)
+        )
+        return bool(res.get("Attributes", {}).get("cancelRequested"))
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await self.table.get({"jobId": job_id})
+
+    async def list(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        kwargs = {"FilterExpression": Attr("kind").eq(kind)} if kind else {}
+        return [record async for record in self.table.scan_all(**kwargs)]
+
+    async def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """다른 인스턴스에서 실행 중인 작업에 취소 표시 (실행 인스턴스가 다음 동기화 때 중단)"""
+        try:
+            res = await self.table.update(
+                {"jobId": job_id},
+                UpdateExpression="SET cancelRequested = :t",
+                ConditionExpression="attribute_exists(jobId)",
+                ExpressionAttributeValues={":t": True},
+                ReturnValues="ALL_NEW",
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return None
+            raise
+        return res.get("Attributes")
+
+
+def record_to_dict(record: Dict[str, Any], include_items: bool = True) -> Dict[str, Any]:
+    """JobTable 아이템 → Job.to_dict() 와 같은 형식"""
+    data = {
+        "jobId": record["jobId"],
+        "kind": record.get("kind"),
+        "status": record.get("status"),
+        "params": record.get("params") or {},
+        "createdAt": record.get("createdAt"),
+        "startedAt": record.get("startedAt"),
+        "finishedAt": record.get("finishedAt"),
+        "cancelRequested": bool(record.get("cancelRequested")),
+        "totals": {k: int(v) for k, v in (record.get("totals") or {}).items()},
+        "error": record.get("error"),
+    }
+    if include_items:
+        data["items"] = json.loads(record["items"]) if record.get("items") else {}
+        data["result"] = json.loads(record["result"]) if record.get("result") else None
+    return data
+
+
+class JobManager:
+    """
+    작업 실행기
+    - submit(): 작업을 등록하고 바로 반환, 이벤트 루프의 태스크로 실행
+    - 동시에 max_running 개까지만 실행 (나머지는 queued 상태로 대기)
+    - exclusive=INSTANCE: 이 인스턴스에서 종류별 1개만
+      exclusive=CLUSTER: 종류별 리스(ScrapLeaseTable, job#{kind})로 인스턴스 전체에서 1개만
+    - 상태 / 카운터는 JOB_SYNC_SECONDS 마다 JobTable 에 저장 → 조회·취소는 어느 인스턴스에서나 가능
+    - cancel(): 이 인스턴스의 작업이면 바로 취소, 아니면 취소 표시 → 실행 인스턴스가 동기화 때 중단
+    실행 중인 태스크는 이 인스턴스 메모리에만 있음 (완료 작업은 최근 history_limit 개 보관)
+    """
+
+    def __init__(self, store: JobStore, leases: LeaseManager,
+                 max_running: int = JOB_MAX_RUNNING, history_limit: int = JOB_HISTORY_LIMIT,
+                 sync_seconds: float = JOB_SYNC_SECONDS):
+        self.store = store
+        self.leases = leases
+        self.max_running = max_running
+        self.history_limit = history_limit
+        self.sync_seconds = sync_seconds
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._submit_locks: Dict[str, asyncio.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _slot(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_running)
+        return self._slots
+
+    def _submit_lock(self, kind: str) -> asyncio.Lock:
+        if kind not in self._submit_locks:
+            self._submit_locks[kind] = asyncio.Lock()
+        return self._submit_locks[kind]
+
+    async def submit(self, kind: str, func: Callable[[Job], Awaitable[Any]],
+                     params: Optional[Dict[str, Any]] = None, exclusive: Optional[str] = None) -> Job:
+        """
+        func(job) 코루틴을 백그라운드로 실행 (실행 중인 이벤트 루프 안에서 호출)
+        exclusive (INSTANCE / CLUSTER) 범위에 같은 종류가 이미 대기/실행 중이면 JobConflict
+        """
+        if not exclusive:
+            return await self._start(Job(kind, params), func)
+        # 확인 → 리스 획득 → 등록을 종류별 락 안에서 (같은 인스턴스의 동시 요청이 둘 다 통과하지 않도록)
+        async with self._submit_lock(kind):
+            local = self.local_active(kind)
+            if local:
+                raise JobConflict(kind, local.id)
+            lease = None
+            if exclusive == CLUSTER:
+                lease = await self.leases.acquire(f"job#{kind}")
+                if lease is None:
+                    raise JobConflict(kind, await self._remote_active_id(kind))
+            return await self._start(Job(kind, params), func, lease)
+
+    async def _start(self, job: Job, func: Callable[[Job], Awaitable[Any]], lease: Optional[Lease] = None) -> Job:
+        with self._lock:
+            self._jobs[job.id] = job
+            self._trim()
+        try:
+            await self.store.save(job)
+        except Exception as e:
+            print(f"⚠️ 작업 상태 저장 실패 ({job.kind} {job.id}): {e}")
+        job._task = asyncio.get_running_loop().create_task(self._run(job, func, lease))
+        return job
+
+    async def _run(self, job: Job, func: Callable[[Job], Awaitable[Any]], lease: Optional[Lease]) -> None:
+        sync = asyncio.ensure_future(self._sync_loop(job))
+        try:
+            if lease is not None:
+                async with self.leases.keep(lease):
+                    await self._execute(job, func)
+            else:
+                await self._execute(job, func)
+        finally:
+            sync.cancel()
+            await self._sync(job, include_items=True)
+
+    async def _execute(self, job: Job, func: Callable[[Job], Awaitable[Any]]) -> None:
+        try:
+            async with self._slot():
+                job.check_cancelled()
+                job.status = RUNNING
+                job.started_at = datetime.utcnow().isoformat()
+                job.result = await func(job)
+                job.status = SUCCEEDED
+        except (asyncio.CancelledError, JobCancelled):
+            job.status = CANCELLED
+        except Exception as e:
+            job.status = FAILED
+            job.error = getattr(e, "detail", None) or str(e)
+            print(f"⚠️ 작업 실패 ({job.kind} {job.id}): {job.error}")
+        finally:
+            job.finished_at = datetime.utcnow().isoformat()
+
+    async def _sync(self, job: Job, include_items: bool = False) -> bool:
+        """상태 저장 (실패해도 작업은 계속) → 원격 취소 요청 여부"""
+        try:
+            return await self.store.save(job, include_items)
+        except Exception as e:
+            print(f"⚠️ 작업 상태 저장 실패 ({job.kind} {job.id}): {e}")
+            return False
+
+    async def _sync_loop(self, job: Job) -> None:
+        while job.status not in FINISHED:
+            await asyncio.sleep(self.sync_seconds)
+            if await self._sync(job) and not job.cancelled:
+                print(f"🛑 작업 취소 요청 수신 ({job.kind} {job.id})")
+                self.cancel(job.id)
+
+    async def _remote_active_id(self, kind: str) -> Optional[str]:
+        try:
+            records = await self.store.list(kind)
+        except Exception:
+            return None
+        active = [r for r in records if r.get("status") not in FINISHED]
+        return max(active, key=lambda r: r.get("createdAt") or "")["jobId"] if active else None
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.history_limit)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """이 인스턴스에서 실행된 작업"""
+        return self._jobs.get(job_id)
+
+    def list(self, kind: Optional[str] = None) -> List[Job]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job for job in jobs if kind is None or job.kind == kind]
+
+    def local_active(self, kind: str) -> Optional[Job]:
+        """이 인스턴스의 같은 종류 대기/실행 중 작업"""
+        return next((job for job in self.list(kind) if job.status not in FINISHED), None)
+
+    async def describe(self, job_id: str, include_items: bool = True) -> Optional[Dict[str, Any]]:
+        """작업 상태 (이 인스턴스의 작업이면 메모리, 아니면 JobTable)"""
+        job = self.get(job_id)
+        if job is not None:
+            return job.to_dict(include_items)
+        record = await self.store.get(job_id)
+        return record_to_dict(record, include_items) if record else None
+
+    async def describe_all(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """전체 인스턴스 작업 목록 (최신순, 이 인스턴스 작업은 메모리 값 우선)"""
+        jobs = {record["jobId"]: record_to_dict(record, include_items=False)
+                for record in await self.store.list(kind)}
+        for job in self.list(kind):
+            jobs[job.id] = job.to_dict(include_items=False)
+        return sorted(jobs.values(), key=lambda d: d.get("createdAt") or "", reverse=True)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if job.status not in FINISHED:
+            job._cancel.set()
+            if job._task is not None:
+                job._task.cancel()
+        return job
+
+    async def request_cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """이 인스턴스의 작업이면 바로 취소, 아니면 JobTable 에 취소 표시"""
+        job = self.cancel(job_id)
+        if job is not None:
+            return job.to_dict(include_items=False)
+        record = await self.store.get(job_id)
+        if record is None:
+            return None
+        if record.get("status") in FINISHED:
+            return record_to_dict(record, include_items=False)
+        record = await self.store.request_cancel(job_id)
+        return record_to_dict(record, include_items=False) if record else None
+
+
+job_manager = JobManager(JobStore(TableRepository(JOB_TABLE)), LeaseManager(TableRepository(SCRAP_LEASE_TABLE)))
@@ -0,0 +1,150 @@
+import asyncio
+import os
+import socket
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from botocore.exceptions import ClientError
+
+from app.modules.repository import TableRepository
+
+SCRAP_LEASE_TABLE = "ScrapLeaseTable"   # PK: leaseKey, TTL 속성: expiresAt
+LEASE_SECONDS = int(os.environ.get("SCRAP_LEASE_SECONDS", "120"))
+
+# 인스턴스 식별자 (같은 호스트에서 여러 프로세스가 떠도 구분되도록 pid + 난수)
+NODE_ID = os.environ.get("NODE_ID") or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def _conditional_failed(e: ClientError) -> bool:
+    return e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException"
+
+
+class Lease:
+    """
+    보유 중인 리스 1건 (heartbeat 가 갱신에 실패하면 lost=True)
+    token: 이번 획득에만 쓰는 owner 값 → 같은 프로세스의 다른 보유자와도 구분
+    """
+
+    def __init__(self, key: str, token: str, expires_at: int):
+        self.key = key
+        self.token = token
+        self.expires_at = expires_at
+        self.lost = False
+
+
+class LeaseManager:
+    """
+    DynamoDB 조건부 쓰기 기반 리스 (노드 간 상호 배제)
+    - acquire: 리스가 없거나 만료됐을 때만 기록 (get → put 사이 경쟁 없음)
+      owner 는 획득마다 새 토큰 ({NODE_ID}:{uuid}) → 같은 프로세스 안에서도 재진입 불가
+    - heartbeat / release: owner 가 내 토큰일 때만 (이미 다른 보유자에게 넘어간 리스는 건드리지 않음)
+    - 프로세스가 죽으면 갱신이 멈춰 duration 후 다른 노드가 가져갈 수 있음
+      (만료된 행은 DynamoDB TTL 로 정리)
+    """
+
+    def __init__(self, table: TableRepository, owner: str = NODE_ID, duration: int = LEASE_SECONDS):
+        self.table = table
+        self.owner = owner
+        self.duration = duration
+
+    async def acquire(self, key: str) -> Optional[Lease]:
+        now = int(time.time())
+        expires_at = now + self.duration
+        token = f"{self.owner}:{uuid.uuid4().hex}"
+        try:
+            await self.table.put(
+                {
+                    "leaseKey": key,
+                    "owner": token,
+                    "acquiredAt": now,
+                    "heartbeatAt": now,
+                    "expiresAt": expires_at,
+                },
+                ConditionExpression="attribute_not_exists(leaseKey) OR expiresAt < :now",
+                ExpressionAttributeValues={":now": now},
+            )
+        except ClientError as e:
+            if _conditional_failed(e):
+                return None
+            raise
+        return Lease(key, token, expires_at)
+
+    async def renew(self, lease: Lease) -> bool:
+        now = int(time.time())
+        expires_at = now + self.duration
+        try:
+            await self.table.update(
+                {"leaseKey": lease.key},
+                UpdateExpression="SET expiresAt = :exp, heartbeatAt = :now",
+                ConditionExpression="#o = :me",
+                ExpressionAttributeNames={"#o": "owner"},
+                ExpressionAttributeValues={":exp": expires_at, ":now": now, ":me": lease.token},
+            )
+        except ClientError as e:
+            if _conditional_failed(e):
+                lease.lost = True
+                return False
+            raise
+        lease.expires_at = expires_at
+        return True
+
+    async def release(self, lease: Lease) -> None:
+        try:
+            await self.table.delete(
+                {"leaseKey": lease.key},
+                ConditionExpression="#o = :me",
+                ExpressionAttributeNames={"#o": "owner"},
+                ExpressionAttributeValues={":me": lease.token},
+            )
+        except ClientError as e:
+            if not _conditional_failed(e):   # 이미 만료되어 다른 보유자가 가져간 경우는 무시
+                raise
+
+    async def _heartbeat(self, lease: Lease) -> None:
+        interval = max(self.duration / 3, 1)
+        while not lease.lost:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.renew(lease):
+                    print(f"⚠️ 리스 상실: {lease.key}")
+            except Exception as e:
+                # 일시 오류는 다음 주기에 재시도 (만료 전까지 여유 2주기)
+                print(f"⚠️ 리스 갱신 실패 ({lease.key}): {e}")
+                if time.time() >= lease.expires_at:
+                    lease.lost = True
+
+    @asynccontextmanager
+    async def keep(self, lease: Lease) -> AsyncIterator[Lease]:
+        """이미 획득한 리스를 블록 동안 heartbeat 로 유지하고 끝나면 해제"""
+        heartbeat = asyncio.ensure_future(self._heartbeat(lease))
+        try:
+            yield lease
+        finally:
+            heartbeat.cancel()
+            try:
+                await self.release(lease)
+            except Exception as e:
+                print(f"⚠️ 리스 해제 실패 ({lease.key}): {e}")
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[Optional[Lease]]:
+        """
+        async with leases.hold(key) as lease:
+            if lease is None: ...   # 다른 노드가 보유 중
+            ...                     # lease.lost 가 True 가 되면 작업 중단
+        """
+        lease = await self.acquire(key)
+        if lease is None:
+            yield None
+            return
+        async with self.keep(lease):
+            yield lease
+
+
+scrap_leases = LeaseManager(TableRepository(SCRAP_LEASE_TABLE))
+
+
+def source_lease_key(source_id: str) -> str:
+    return f"source#{source_id}"
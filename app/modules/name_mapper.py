@@ -1,32 +1,241 @@
+import hashlib
 import os
+import tempfile
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, Set
 
 NAME_MAP_FILE = os.path.join(os.path.dirname(__file__), "prompts", "name_map.txt")
 
+
+class AhoCorasick:
+    """
+    다중 패턴 문자열 매칭 오토마톤
+    - 본문 길이에 비례하는 한 번의 순회로 모든 패턴 출현 여부 확인 (패턴 수와 무관)
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[str]] = [set()]
+
+        for pattern in patterns:
+            if not pattern:
+                continue
+            node = 0
+            for ch in pattern:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = nxt
+            self._out[node].add(pattern)
+
+        # BFS 로 실패 링크 구성
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[str]:
+        """text 에 등장하는 패턴 집합"""
+        found: Set[str] = set()
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+
+class _Snapshot:
+    """파싱된 name_map 한 버전 (읽기 전용, 교체 단위)"""
+
+    def __init__(self, text: str, stat):
+        self.text = text.strip()
+        self.stat = stat   # (mtime_ns, size) — 읽을 당시 파일 상태, 파일 없으면 None
+        self.version = hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:16]
+        self.lines: List[str] = []
+        self.by_korean: Dict[str, List[int]] = {}
+        self.by_english: Dict[str, List[int]] = {}
+        self.by_name: Dict[str, List[int]] = {}   # 한글명 + 영문명 (본문 검색용)
+        self._automaton = None
+        self._lock = threading.Lock()
+
+        for line in self.text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            i = len(self.lines)
+            parts = line.split("|")
+            korean = parts[0].strip()
+            english = parts[1].strip() if len(parts) > 1 else ""
+            if korean:
+                self.by_korean.setdefault(korean, []).append(i)
+                self.by_name.setdefault(korean, []).append(i)
+            if english:
+                self.by_english.setdefault(english.lower(), []).append(i)
+                self.by_name.setdefault(english, []).append(i)
+            self.lines.append(line)
+
+    @property
+    def automaton(self) -> AhoCorasick:
+        if self._automaton is None:
+            with self._lock:
+                if self._automaton is None:
+                    self._automaton = AhoCorasick(self.by_name.keys())
+        return self._automaton
+
+
+class NameMapStore:
+    """
+    name_map.txt 메모리 인덱스 저장소
+    - 파일은 한 번만 파싱하고 mtime/크기가 바뀐 경우에만 다시 읽음
+    - 한글명 / 영문명(대소문자 무시) 조회 O(1)
+    - 수정은 락 안에서 임시 파일 작성 후 os.replace 로 원자적 교체
+    """
+
+    def __init__(self, path: str = NAME_MAP_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    # ---------- 읽기 ----------
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_file(self) -> str:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    def _current(self) -> _Snapshot:
+        snap = self._snapshot
+        stat = self._file_stat()
+        if snap is not None and snap.stat == stat:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            stat = self._file_stat()
+            if snap is None or snap.stat != stat:
+                snap = self._snapshot = _Snapshot(self._read_file() if stat else "", stat)
+            return snap
+
+    @property
+    def version(self) -> str:
+        """현재 내용 해시 (내용이 바뀌면 달라짐)"""
+        return self._current().version
+
+    def text(self) -> str:
+        """원문 (한글명|영문명|간단설명)"""
+        return self._current().text
+
+    def find_korean(self, name: str) -> List[str]:
+        snap = self._current()
+        return [snap.lines[i] for i in snap.by_korean.get(name, [])]
+
+    def find_english(self, name: str) -> List[str]:
+        snap = self._current()
+        return [snap.lines[i] for i in snap.by_english.get(name.lower(), [])]
+
+    def select(self, content: str) -> str:
+        """본문에 등장하는 한글명/영문명의 매핑 라인만 원래 순서대로 반환"""
+        snap = self._current()
+        hits = sorted({i for name in snap.automaton.find(content) for i in snap.by_name[name]})
+        return "\n".join(snap.lines[i] for i in hits)
+
+    # ---------- 쓰기 (self._lock 안에서만 호출) ----------
+
+    def _write(self, text: str) -> None:
+        """임시 파일에 쓰고 원자적으로 교체 (읽는 쪽은 항상 완전한 파일만 보게 됨)"""
+        fd, tmp_path = tempfile.mkstemp(prefix=".name_map.", suffix=".tmp", dir=os.path.dirname(self.path))
+        try:
+            # mkstemp 는 0600 으로 만들므로 기존 파일 권한 유지 (없으면 0644)
+            try:
+                mode = os.stat(self.path).st_mode & 0o777
+            except FileNotFoundError:
+                mode = 0o644
+            os.chmod(tmp_path, mode)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self._snapshot = _Snapshot(text, self._file_stat())
+
+    def append(self, entry_line: str) -> None:
+        with self._lock:
+            self._write(self._read_file() + "\n" + entry_line.strip())
+
+    def overwrite(self, new_text: str) -> None:
+        with self._lock:
+            self._write(new_text.strip())
+
+    def delete_korean(self, korean_name: str) -> int:
+        """한글명이 일치하는 라인 삭제 (빈 줄도 정리), 삭제된 라인 수 반환"""
+        with self._lock:
+            if self._file_stat() is None:
+                raise FileNotFoundError("name_map.txt not found")
+            lines = [line.strip() for line in self._read_file().splitlines() if line.strip()]
+            new_lines = [line for line in lines if line.split("|", 1)[0] != korean_name]
+            self._write("\n".join(new_lines))
+            return len(lines) - len(new_lines)
+
+
+name_map_store = NameMapStore()
+
+
+def select_name_map_text(content: str) -> str:
+    """
+    본문에 실제로 등장하는 이름(한글명/영문명)의 매핑 라인만 원래 순서대로 반환
+    → 프롬프트 크기가 사전 크기가 아닌 본문 크기에 비례
+    """
+    return name_map_store.select(content)
+
+
 def load_name_map_text() -> str:
     """
     name_map.txt 파일의 원문을 그대로 불러옴.
     (한글명|영문명|간단설명)
     """
-    if not os.path.exists(NAME_MAP_FILE):
-        return ""
-    with open(NAME_MAP_FILE, "r", encoding="utf-8") as f:
-        return f.read().strip()
+    return name_map_store.text()
 
 
 def append_name_entry(entry_line: str):
     """
     새 항목(한글명|영문명|간단설명)을 파일 맨 아래에 추가
     """
-    with open(NAME_MAP_FILE, "a", encoding="utf-8") as f:
-        f.write("\n" + entry_line.strip())
+    name_map_store.append(entry_line)
 
 
 def overwrite_name_map(new_text: str):
     """
     전체 내용을 덮어쓰기 (파일 교체)
     """
-    with open(NAME_MAP_FILE, "w", encoding="utf-8") as f:
-        f.write(new_text.strip())
+    name_map_store.overwrite(new_text)
 
 
 def delete_name_entry(korean_name: str):
@@ -34,19 +243,4 @@ def delete_name_entry(korean_name: str):
     특정 한글명으로 시작하는 라인 삭제
     (한글명|... 형태에서 첫 번째 구분자 전까지 일치하는 라인을 제거)
     """
-    if not os.path.exists(NAME_MAP_FILE):
-        raise FileNotFoundError("name_map.txt not found")
-
-    with open(NAME_MAP_FILE, "r", encoding="utf-8") as f:
-        lines = f.readlines()
-
-    new_lines = []
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        if not stripped.split("|", 1)[0] == korean_name:
-            new_lines.append(stripped)
-
-    with open(NAME_MAP_FILE, "w", encoding="utf-8") as f:
-        f.write("\n".join(new_lines))
+    name_map_store.delete_korean(korean_name)
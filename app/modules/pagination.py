@@ -0,0 +1,30 @@
+import base64
+import json
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Unsupported key type: {type(value)}")
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """LastEvaluatedKey → 불투명 커서 문자열 (다음 페이지 없으면 None)"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, default=_default, separators=(",", ":"), sort_keys=True)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """커서 문자열 → ExclusiveStartKey (형식이 잘못되면 ValueError)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(key, dict):
+        raise ValueError("Invalid cursor")
+    return key
@@ -0,0 +1,71 @@
+import os
+import random
+import time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+# 수집 주기 범위 (초)
+POLL_MIN_INTERVAL = int(os.environ.get("POLL_MIN_INTERVAL", str(10 * 60)))
+POLL_MAX_INTERVAL = int(os.environ.get("POLL_MAX_INTERVAL", str(24 * 3600)))
+POLL_DEFAULT_INTERVAL = int(os.environ.get("POLL_DEFAULT_INTERVAL", str(30 * 60)))
+
+RATE_SMOOTHING = 0.3      # 신규 기사 비율 EWMA 가중치 (최근 관측 비중)
+BACKOFF_FACTOR = 2.0      # 새 기사가 없을 때 주기 배수
+TARGET_NEW_PER_POLL = 1.0  # 바쁜 수집처는 1회 수집당 신규 ~1건이 되도록 주기를 좁힘
+JITTER = 0.1              # 수집처들이 같은 시각에 몰리지 않도록 ±10%
+
+
+def _num(value: Any, default: float) -> float:
+    """DynamoDB Decimal / None → float"""
+    return float(value) if value is not None else default
+
+
+def is_due(src: Dict[str, Any], now: Optional[float] = None) -> bool:
+    """nextDueAt 이 없거나 지났으면 수집 대상"""
+    now = time.time() if now is None else now
+    return _num(src.get("nextDueAt"), 0) <= now
+
+
+def next_schedule(src: Dict[str, Any], new_articles: Optional[int], failed: int = 0,
+                  now: Optional[float] = None) -> Dict[str, Any]:
+    """
+    수집 결과 → 다음 수집 일정 (SourceMetaTable 에 저장할 값)
+    - newRate: 시간당 신규 기사 수 (EWMA)
+    - 새 기사가 있으면 기대 신규 수가 TARGET_NEW_PER_POLL 이 되는 주기로 좁힘 (현재 주기 이하)
+    - 없으면 지수 백오프 (POLL_MAX_INTERVAL 까지)
+    - new_articles=None (수집 실패) 이면 주기는 그대로 두고 다음 주기에 재시도
+    - failed > 0 (새 링크는 있었지만 본문 수집/저장 실패) 도 주기 유지 (백오프하지 않음)
+      실패한 기사는 다음 수집에서 신규로 잡히므로 비율도 그때 반영
+      (URL_MAX_FAILED_ATTEMPTS 번 실패해 포기한 URL 은 failed 에 넣지 않음 → 깨진 링크만 남으면 다시 백오프)
+    - 첫 수집은 기본 주기로 시작
+    """
+    now = time.time() if now is None else now
+    interval = _num(src.get("pollIntervalSec"), POLL_DEFAULT_INTERVAL)
+    rate = _num(src.get("newRate"), 0.0)
+    last_crawl = _num(src.get("lastCrawlAt"), now - interval)
+    elapsed_hours = max(now - last_crawl, 60) / 3600
+
+    values: Dict[str, Any] = {}
+    if new_articles is not None and failed:
+        if new_articles > 0:
+            values["lastChangeAt"] = int(now)
+    elif new_articles is not None:
+        values["lastCrawlAt"] = int(now)
+        if src.get("lastCrawlAt") is None:
+            # 첫 수집: 쌓여 있던 기사가 모두 신규로 잡히므로 비율 계산에서 제외
+            values["lastChangeAt"] = int(now)
+            rate = 0.0
+        else:
+            rate = RATE_SMOOTHING * (new_articles / elapsed_hours) + (1 - RATE_SMOOTHING) * rate
+            if new_articles > 0:
+                values["lastChangeAt"] = int(now)
+                busy_interval = TARGET_NEW_PER_POLL / rate * 3600 if rate > 0 else interval
+                interval = min(interval, busy_interval)
+            else:
+                interval *= BACKOFF_FACTOR
+        values["newRate"] = Decimal(str(round(rate, 4)))   # boto3 는 float 대신 Decimal
+
+    interval = int(min(max(interval, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL))
+    values["pollIntervalSec"] = interval
+    values["nextDueAt"] = int(now + interval * random.uniform(1 - JITTER, 1 + JITTER))
+    return values
@@ -1,7 +1,82 @@
+import hashlib
 import os
+import re
+import threading
+from typing import Dict, List
 
 PROMPT_DIR = os.path.join(os.path.dirname(__file__), "prompts")
 
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+class CompiledPrompt:
+    """
+    {{name}} 자리표시자를 미리 분리해 둔 템플릿
+    - render(): 본문 길이와 무관하게 조각들을 한 번의 join 으로 조립
+      (본문 안에 {{...}} 가 있어도 다시 치환되지 않음)
+    - version: 템플릿 내용 해시 (캐시/지표 키로 사용)
+    """
+
+    def __init__(self, text: str, stat=None):
+        self.text = text
+        self.stat = stat
+        self.version = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        # 짝수 인덱스: 리터럴, 홀수 인덱스: 자리표시자 이름
+        self._segments: List[str] = PLACEHOLDER_RE.split(text)
+        self.placeholders = frozenset(self._segments[1::2])
+
+    def render(self, **values: str) -> str:
+        """자리표시자 치환 (값이 없으면 {{name}} 그대로 유지)"""
+        segments = self._segments
+        return "".join(
+            seg if i % 2 == 0 else values.get(seg, "{{" + seg + "}}")
+            for i, seg in enumerate(segments)
+        )
+
+
+_cache: Dict[str, CompiledPrompt] = {}
+_cache_lock = threading.Lock()
+
+
+def _prompt_path(name: str) -> str:
+    return os.path.join(PROMPT_DIR, f"{name}.txt")
+
+
+def get_prompt(name: str) -> CompiledPrompt:
+    """
+    컴파일된 프롬프트 템플릿 (파일 mtime/크기가 바뀐 경우에만 다시 읽음)
+    Args:
+        name (str): 파일명 (확장자 제외)
+    """
+    path = _prompt_path(name)
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Prompt file not found: {path}")
+    stat = (st.st_mtime_ns, st.st_size)
+
+    compiled = _cache.get(name)
+    if compiled is not None and compiled.stat == stat:
+        return compiled
+
+    with _cache_lock:
+        compiled = _cache.get(name)
+        if compiled is None or compiled.stat != stat:
+            with open(path, "r", encoding="utf-8") as f:
+                compiled = _cache[name] = CompiledPrompt(f.read(), stat)
+        return compiled
+
+
+def render_prompt(name: str, **values: str) -> str:
+    """템플릿 로드 + 치환"""
+    return get_prompt(name).render(**values)
+
+
+def prompt_version(name: str) -> str:
+    """템플릿 버전 해시"""
+    return get_prompt(name).version
+
+
 def load_prompt(name: str) -> str:
     """
     지정된 프롬프트 템플릿 파일을 로드
@@ -10,9 +85,4 @@ def load_prompt(name: str) -> str:
     Returns:
         str: 프롬프트 문자열
     """
-    path = os.path.join(PROMPT_DIR, f"{name}.txt")
-    if not os.path.exists(path):
-        raise FileNotFoundError(f"Prompt file not found: {path}")
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
-
+    return get_prompt(name).text
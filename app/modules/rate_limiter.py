@@ -0,0 +1,87 @@
+import threading
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷 (분당 rate 만큼 채워짐, 최대 capacity 까지 누적)
+    - acquire(): 토큰이 모자라면 채워질 때까지 대기
+    - debit(): 실제 사용량 보정 (음수 잔량 허용 → 이후 요청이 그만큼 늦춰짐)
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_minute = float(rate_per_minute)
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_minute / 60.0)
+        self._updated = now
+
+    def set_rate(self, rate_per_minute: float) -> None:
+        with self._lock:
+            self._refill()
+            self.rate_per_minute = max(float(rate_per_minute), 1e-6)
+
+    def acquire(self, amount: float = 1.0) -> None:
+        amount = min(float(amount), self.capacity)   # capacity 보다 큰 요청이 영원히 대기하지 않도록
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) * 60.0 / self.rate_per_minute
+            time.sleep(min(wait, 5.0))
+
+    def debit(self, amount: float) -> None:
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+
+class AdaptiveRateLimiter:
+    """
+    요청 수(RPM) + 토큰 수(TPM) 쿼터 동시 적용 + 스로틀링 시 속도 자동 조절 (AIMD)
+    - on_throttle(): 허용 속도를 절반으로 (최소 min_scale)
+    - on_success(): 허용 속도를 조금씩 회복 (최대 쿼터)
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float,
+                 min_scale: float = 0.1, recovery_step: float = 0.05):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.min_scale = min_scale
+        self.recovery_step = recovery_step
+        self.scale = 1.0
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._lock = threading.Lock()
+
+    def _apply_scale(self) -> None:
+        self._requests.set_rate(self.requests_per_minute * self.scale)
+        self._tokens.set_rate(self.tokens_per_minute * self.scale)
+
+    def acquire(self, estimated_tokens: int) -> None:
+        self._requests.acquire(1)
+        self._tokens.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """추정치와 실제 사용 토큰 차이 보정"""
+        self._tokens.debit(actual_tokens - estimated_tokens)
+
+    def on_throttle(self) -> None:
+        with self._lock:
+            self.scale = max(self.min_scale, self.scale * 0.5)
+            self._apply_scale()
+
+    def on_success(self) -> None:
+        if self.scale >= 1.0:
+            return
+        with self._lock:
+            self.scale = min(1.0, self.scale + self.recovery_step)
+            self._apply_scale()
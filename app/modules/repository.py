@@ -0,0 +1,186 @@
+import asyncio
+import weakref
+from contextlib import AsyncExitStack
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Union
+
+import aioboto3
+from botocore.exceptions import ClientError
+
+from app.modules.aws_clients import AWS_REGION, client_kwargs
+from app.modules.dynamo_scan import projection_kwargs
+
+ARTICLE_TABLE = "ArticleTable"
+NEWS_TABLE = "NewsTable"
+SOURCE_TABLE = "SourceMetaTable"
+
+_DONE = object()   # 세그먼트 종료 표시
+
+
+class AsyncAws:
+    """
+    aioboto3 DynamoDB 리소스 / S3 클라이언트 (이벤트 루프당 1세트, 첫 사용 시 생성)
+    - 핸들러가 블로킹 boto3 대신 await 로 호출 → 기본 스레드풀을 점유하지 않음
+    - 루프가 바뀌면(테스트 클라이언트, asyncio.run 등) 새 루프에서 다시 연결
+    """
+
+    def __init__(self, region_name: str = AWS_REGION):
+        self.region_name = region_name
+        self._session = aioboto3.Session()
+        self._loop = None
+        self._stack: Optional[AsyncExitStack] = None
+        self._dynamodb = None
+        self._s3 = None
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+    async def _ensure(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        lock = self._locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            if self._loop is loop:
+                return
+            if self._stack is not None:
+                # 이전 루프에서 연 커넥션 정리 (이미 닫힌 루프의 세션이면 실패할 수 있음 → 무시)
+                old_stack, self._stack = self._stack, None
+                try:
+                    await old_stack.aclose()
+                except Exception as e:
+                    print(f"⚠️ 이전 AWS 커넥션 정리 실패: {e}")
+            stack = AsyncExitStack()
+            # 동기 boto3 와 같은 Config (풀 크기 / 재시도 / 타임아웃 / 엔드포인트)
+            dynamodb = await stack.enter_async_context(
+                self._session.resource("dynamodb", **{**client_kwargs("dynamodb"), "region_name": self.region_name}))
+            s3 = await stack.enter_async_context(
+                self._session.client("s3", **{**client_kwargs("s3"), "region_name": self.region_name}))
+            self._stack, self._dynamodb, self._s3, self._loop = stack, dynamodb, s3, loop
+
+    async def table(self, name: str):
+        await self._ensure()
+        return await self._dynamodb.Table(name)
+
+    async def s3(self):
+        await self._ensure()
+        return self._s3
+
+    async def close(self) -> None:
+        """앱 종료 시 커넥션 정리 (현재 루프에서 연 것만)"""
+        if self._stack is not None and self._loop is asyncio.get_running_loop():
+            await self._stack.aclose()
+        self._stack = self._dynamodb = self._s3 = self._loop = None
+
+
+aws = AsyncAws()
+
+
+class TableRepository:
+    """DynamoDB 테이블 1개에 대한 async 접근 (boto3 Table 과 같은 인자/반환 형식)"""
+
+    def __init__(self, table_name: str, client: AsyncAws = aws):
+        self.table_name = table_name
+        self.client = client
+
+    async def _table(self):
+        return await self.client.table(self.table_name)
+
+    async def get(self, key: Dict[str, Any], **kwargs) -> Optional[dict]:
+        res = await (await self._table()).get_item(Key=key, **kwargs)
+        return res.get("Item")
+
+    async def put(self, item: Dict[str, Any], **kwargs) -> dict:
+        return await (await self._table()).put_item(Item=item, **kwargs)
+
+    async def update(self, key: Dict[str, Any], **kwargs) -> dict:
+        return await (await self._table()).update_item(Key=key, **kwargs)
+
+    async def delete(self, key: Dict[str, Any], **kwargs) -> dict:
+        return await (await self._table()).delete_item(Key=key, **kwargs)
+
+    async def query(self, **kwargs) -> dict:
+        return await (await self._table()).query(**kwargs)
+
+    async def _scan_segment(self, kwargs: Dict[str, Any], out: asyncio.Queue) -> None:
+        """
+        세그먼트 1개의 페이지를 out 으로 전달, 끝나면 _DONE / 실패하면 예외 객체 (둘 다 종료 신호)
+        취소되면 아무것도 넣지 않고 종료 (소비자가 멈춰 큐가 가득 찬 상태에서 막히지 않도록)
+        """
+        try:
+            table = await self._table()
+            while True:
+                res = await table.scan(**kwargs)
+                await out.put(res.get("Items", []))
+                last_key = res.get("LastEvaluatedKey")
+                if not last_key:
+                    break
+                kwargs = {**kwargs, "ExclusiveStartKey": last_key}
+        except Exception as e:
+            await out.put(e)
+            return
+        await out.put(_DONE)
+
+    async def scan_all(self, segments: int = 1,
+                       projection: Union[str, Iterable[str], None] = None,
+                       **scan_kwargs) -> AsyncIterator[dict]:
+        """
+        dynamo_scan.scan_all 의 async 버전
+        - LastEvaluatedKey 페이지네이션, segments > 1 이면 Segment/TotalSegments 병렬 스캔 (세그먼트별 태스크)
+        """
+        kwargs = dict(scan_kwargs)
+        if projection:
+            kwargs.update(projection_kwargs(projection, kwargs.get("ExpressionAttributeNames")))
+
+        segments = max(segments, 1)
+        segment_kwargs = [kwargs] if segments == 1 else [
+            {**kwargs, "Segment": segment, "TotalSegments": segments} for segment in range(segments)
+        ]
+        out: asyncio.Queue = asyncio.Queue(maxsize=segments * 2)
+        tasks = [asyncio.ensure_future(self._scan_segment(kw, out)) for kw in segment_kwargs]
+        try:
+            finished = 0
+            while finished < segments:
+                page = await out.get()
+                if page is _DONE:
+                    finished += 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    for item in page:
+                        yield item
+        finally:
+            # 소비자가 중간에 멈추거나 오류가 나면 남은 세그먼트 중단 (끝날 때까지 기다려 커넥션 정리)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class ObjectStorage:
+    """S3 버킷 1개에 대한 async 접근"""
+
+    def __init__(self, bucket: str, client: AsyncAws = aws):
+        self.bucket = bucket
+        self.client = client
+
+    async def head(self, key: str) -> Optional[dict]:
+        """객체 메타 (없으면 None)"""
+        s3 = await self.client.s3()
+        try:
+            return await s3.head_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    async def get(self, key: str) -> bytes:
+        s3 = await self.client.s3()
+        res = await s3.get_object(Bucket=self.bucket, Key=key)
+        async with res["Body"] as body:
+            return await body.read()
+
+    async def put(self, key: str, body: bytes, **kwargs) -> dict:
+        s3 = await self.client.s3()
+        return await s3.put_object(Bucket=self.bucket, Key=key, Body=body, **kwargs)
+
+
+articles = TableRepository(ARTICLE_TABLE)
+news = TableRepository(NEWS_TABLE)
+sources = TableRepository(SOURCE_TABLE)
@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+
+# 캐시 네임스페이스
+NEWS_CATEGORY = "news.category"
+NEWS_ARTICLE = "news.article"
+SOURCES = "sources"
+
+
+class CachedResponse:
+    """직렬화가 끝난 JSON 응답 (본문 해시 = strong ETag)"""
+
+    def __init__(self, payload: Any, headers: Optional[Dict[str, str]] = None):
+        # fastapi JSONResponse 와 같은 직렬화 (Decimal 등은 jsonable_encoder 로 변환)
+        self.body = json.dumps(
+            jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":"),
+        ).encode("utf-8")
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+        self.headers = dict(headers or {})
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        if not if_none_match:
+            return False
+        tags = [t.strip() for t in if_none_match.split(",")]
+        # If-None-Match 는 약한 비교 (W/ 접두어 무시)
+        return any(t == "*" or (t[2:] if t.startswith("W/") else t) == self.etag for t in tags)
+
+    def to_response(self, request: Request) -> Response:
+        headers = {**self.headers, "ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+class ResponseCache:
+    """
+    조회 API 응답 캐시 (프로세스 내 LRU + TTL)
+    - 데이터는 배치(수집/생성) 때만 바뀌므로 쓰기 경로에서 invalidate() 로 명시적으로 비움
+    - TTL 은 다른 인스턴스에서 일어난 쓰기가 반영되기까지의 상한
+    - 조회 실패(예외)는 캐시하지 않음
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_MAX_ENTRIES, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # (namespace, key) → (expires_at, tag, CachedResponse)
+        self._entries: "OrderedDict[Tuple[str, Hashable], tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: Hashable) -> Optional[CachedResponse]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            if entry[0] <= now:
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return entry[2]
+
+    def put(self, namespace: str, key: Hashable, cached: CachedResponse, tag: Hashable = None) -> None:
+        with self._lock:
+            self._entries[(namespace, key)] = (time.monotonic() + self.ttl_seconds, tag, cached)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_load(self, namespace: str, key: Hashable,
+                    loader: Callable[[], Tuple[Any, Optional[Dict[str, str]]]],
+                    tag: Hashable = None) -> CachedResponse:
+        """캐시에 없으면 loader() → (payload, headers) 로 채움"""
+        cached = self.get(namespace, key)
+        if cached is None:
+            payload, headers = loader()
+            cached = CachedResponse(payload, headers)
+            self.put(namespace, key, cached, tag)
+        return cached
+
+    async def aget_or_load(self, namespace: str, key: Hashable,
+                           loader: Callable[[], Awaitable[Tuple[Any, Optional[Dict[str, str]]]]],
+                           tag: Hashable = None) -> CachedResponse:
+        """get_or_load 의 async 버전 (loader 는 코루틴 함수)"""
+        cached = self.get(namespace, key)
+        if cached is None:
+            payload, headers = await loader()
+            cached = CachedResponse(payload, headers)
+            self.put(namespace, key, cached, tag)
+        return cached
+
+    def invalidate(self, namespace: str, key: Hashable = None, tag: Hashable = None) -> int:
+        """
+        namespace 전체 / 특정 key / 특정 tag 항목 삭제
+        Returns: 삭제된 항목 수
+        """
+        with self._lock:
+            doomed = [
+                k for k, entry in self._entries.items()
+                if k[0] == namespace
+                and (key is None or k[1] == key)
+                and (tag is None or entry[1] == tag)
+            ]
+            for k in doomed:
+                del self._entries[k]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def invalidate_news(category: Optional[str] = None, article_id: Optional[str] = None) -> None:
+    """뉴스 생성 후 호출: 해당 카테고리 목록 + 단건 캐시 삭제"""
+    response_cache.invalidate(NEWS_CATEGORY, tag=category)
+    if article_id is not None:
+        response_cache.invalidate(NEWS_ARTICLE, key=article_id)
+
+
+def invalidate_sources() -> None:
+    """수집처 추가/수정/삭제 후 호출"""
+    response_cache.invalidate(SOURCES)
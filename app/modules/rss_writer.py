@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import re
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+KST = timezone(timedelta(hours=9))
+BOM = b'\xef\xbb\xbf'
+
+RSS_LINK = "http://cc.xxq.me/art_news/rss.xml"
+RSS_TITLE = "ArtNews Recent Articles"
+RSS_DESCRIPTION = "오늘 생성된 아트 기사 목록"
+RSS_MAX_ITEMS = 100
+BYLINE = '''\n\nSayArt / Sayart Teams'''
+
+# xml.dom.minidom toprettyxml(indent="  ") 과 동일한 들여쓰기
+_CHANNEL_INDENT = "    "
+_ITEM_INDENT = "      "
+
+
+def _text(value) -> str:
+    """minidom 텍스트/속성 노드와 동일한 이스케이프 (& < " >)"""
+    data = "%s" % (value,)
+    return data.replace("&", "&amp;").replace("<", "&lt;").replace("\"", "&quot;").replace(">", "&gt;")
+
+
+def _cdata(value) -> str:
+    """CDATA 블록 (본문에 ]]> 가 있으면 블록을 나눠서 안전하게 기록)"""
+    data = "%s" % (value,)
+    return "<![CDATA[" + data.replace("]]>", "]]]]><![CDATA[>") + "]]>"
+
+
+def rfc822_kst(dt: datetime) -> str:
+    return dt.astimezone(KST).strftime("%a, %d %b %Y %H:%M:%S +0900")
+
+
+def category_slug(category: str) -> str:
+    """카테고리명 → S3 키에 쓸 수 있는 경로 조각"""
+    return re.sub(r"[^\w-]+", "-", category).strip("-") or "general"
+
+
+def render_head(now_kst: datetime, title: str = RSS_TITLE, link: str = RSS_LINK,
+                description: str = RSS_DESCRIPTION) -> str:
+    """XML 선언 ~ 채널 메타(atom:link) 까지"""
+    pub_str = rfc822_kst(now_kst)
+    i = _CHANNEL_INDENT
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rss xmlns:atom="http://www.w3.org/2005/Atom" xmlns:art="http://artnews.local/rss" version="2.0">\n'
+        "  <channel>\n"
+        f"{i}<title>{_text(title)}</title>\n"
+        f"{i}<link>{_text(link)}</link>\n"
+        f"{i}<description>{_text(description)}</description>\n"
+        f"{i}<language>ko</language>\n"
+        f"{i}<pubDate>{pub_str}</pubDate>\n"
+        f"{i}<lastBuildDate>{pub_str}</lastBuildDate>\n"
+        f'{i}<atom:link href="{_text(link)}" rel="self" type="application/rss+xml"/>\n'
+    )
+
+
+def render_item(item: dict, now_kst: Optional[datetime] = None) -> str:
+    """뉴스 1건 → <item> 블록"""
+    i = _ITEM_INDENT
+    parts = [
+        f"{_CHANNEL_INDENT}<item>\n",
+        f"{i}<title>{_cdata(item.get('title', 'Untitled'))}</title>\n",
+        f"{i}<link>{_text(item.get('originUrl', ''))}</link>\n",
+        f"{i}<description>{_cdata(item.get('description', '') + BYLINE)}</description>\n",
+        f"{i}<category>{_cdata(item.get('category', 'general'))}</category>\n",
+        # TODO: 수정필요 임시 하드코드 ( 어떻게 변할지 몰라서 )
+        f"{i}<art:articleId>{182012122}</art:articleId>\n",
+        f'{i}<guid isPermaLink="false">{_text(item.get("articleId", ""))}</guid>\n',
+    ]
+    # imageUrl (첫 번째 이미지만)
+    if item.get("imageUrl"):
+        parts.append(f"{i}<imageUrl>{_text(item['imageUrl'])}</imageUrl>\n")
+
+    # pubDate (RFC 형식 변환)
+    now_kst = now_kst or datetime.now(KST)
+    pub_dt = datetime.fromisoformat(item.get("pubDate", now_kst.isoformat()))
+    parts.append(f"{i}<pubDate>{rfc822_kst(pub_dt)}</pubDate>\n")
+    parts.append(f"{_CHANNEL_INDENT}</item>\n")
+    return "".join(parts)
+
+
+def render_tail() -> str:
+    return "  </channel>\n</rss>\n"
+
+
+class Feed(NamedTuple):
+    """빌드된 피드 1개 (category 가 None 이면 전체 피드)"""
+    category: Optional[str]
+    body: bytes
+    digest: str        # 채널 메타 + 아이템 조각 해시 (빌드 시각 제외 → 내용이 같으면 동일)
+    item_count: int
+
+    def gzipped(self) -> bytes:
+        # mtime=0: 같은 내용이면 같은 바이트
+        return gzip.compress(self.body, mtime=0)
+
+
+def _build_feed(category: Optional[str], fragments: List[bytes], now_kst: datetime, **channel) -> Feed:
+    head = render_head(now_kst, **channel).encode("utf-8", "xmlcharrefreplace")
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(channel.items())).encode("utf-8"))
+    for fragment in fragments:
+        digest.update(fragment)
+    body = b"".join([BOM, head, *fragments, render_tail().encode("utf-8")])
+    return Feed(category, body, digest.hexdigest(), len(fragments))
+
+
+class DailyFeed:
+    """
+    당일 피드 증분 캐시 (프로세스 내)
+    - reset(): 당일 파티션 조회 결과로 초기화 (아이템별 직렬화 결과 보관)
+    - add(): 이 인스턴스에서 생성된 뉴스 1건만 직렬화해서 pubDate 순 위치에 병합
+    - merge(): 다른 인스턴스가 생성한 뉴스 (synced_at 이후 파티션 조회 결과) 병합
+    - feeds(): 헤더 + 보관된 아이템 조각 + 꼬리를 이어 붙여 피드 생성
+    synced_at: 마지막으로 DynamoDB 에서 읽은 시각 (이후 생성분은 add() 로 들어온 것만 있음)
+    """
+
+    def __init__(self, max_items: int = RSS_MAX_ITEMS):
+        self.max_items = max_items
+        self.day: Optional[str] = None
+        self.synced_at: Optional[str] = None
+        self._entries: List[tuple] = []   # (pubDate, articleId, item, fragment bytes, category) 최신순
+        self._lock = threading.Lock()
+
+    def is_warm(self, day: str) -> bool:
+        return self.day == day and self.synced_at is not None
+
+    def _entry(self, item: dict) -> tuple:
+        fragment = render_item(item).encode("utf-8", "xmlcharrefreplace")
+        return (item.get("pubDate", ""), item.get("articleId", ""), item, fragment,
+                item.get("category", "general"))
+
+    def reset(self, day: str, items: Iterable[dict], synced_at: str) -> None:
+        entries = [self._entry(item) for item in items]
+        entries.sort(key=lambda e: e[0], reverse=True)
+        with self._lock:
+            self.day = day
+            self.synced_at = synced_at
+            self._entries = entries[:self.max_items]
+
+    def _insert(self, entries: List[tuple], entry: tuple) -> List[tuple]:
+        """articleId 중복 제거 후 pubDate 순 위치에 삽입"""
+        entries = [e for e in entries if e[1] != entry[1]]
+        pos = next((k for k, e in enumerate(entries) if e[0] < entry[0]), len(entries))
+        entries.insert(pos, entry)
+        return entries[:self.max_items]
+
+    def add(self, day: str, item: dict) -> bool:
+        """당일 캐시가 준비된 경우에만 병합 (아니면 다음 전체 빌드에서 반영)"""
+        entry = self._entry(item)
+        with self._lock:
+            if self.day != day:
+                return False
+            self._entries = self._insert(self._entries, entry)
+            return True
+
+    def merge(self, day: str, items: Iterable[dict], synced_at: str) -> bool:
+        """파티션 증분 조회 결과 병합 (이미 있는 아이템은 새 값으로 교체)"""
+        new_entries = [self._entry(item) for item in items]
+        with self._lock:
+            if self.day != day:
+                return False
+            entries = self._entries
+            for entry in new_entries:
+                entries = self._insert(entries, entry)
+            self._entries = entries
+            self.synced_at = synced_at
+            return True
+
+    def feeds(self, now_kst: datetime, title: str = RSS_TITLE,
+              category_link: Optional[Callable[[str], str]] = None, **channel) -> List[Feed]:
+        """
+        아이템을 한 번만 순회해서 전체 피드 + 카테고리별 피드를 함께 빌드
+        (아이템 조각은 이미 직렬화되어 있으므로 피드 수가 늘어도 재직렬화 없음)
+        - category_link(category): 카테고리 피드 자신의 공개 URL (<link> / atom:link rel="self")
+        """
+        with self._lock:
+            entries = list(self._entries)
+
+        combined: List[bytes] = []
+        by_category: Dict[str, List[bytes]] = {}
+        for entry in entries:
+            combined.append(entry[3])
+            by_category.setdefault(entry[4], []).append(entry[3])
+
+        feeds = [_build_feed(None, combined, now_kst, title=title, **channel)]
+        for category, fragments in by_category.items():
+            category_channel = dict(channel)
+            if category_link is not None:
+                category_channel["link"] = category_link(category)
+            feeds.append(_build_feed(category, fragments, now_kst, title=f"{title} - {category}", **category_channel))
+        return feeds
+
+
+daily_feed = DailyFeed()
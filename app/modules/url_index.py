@@ -0,0 +1,193 @@
+import hashlib
+import math
+import os
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from botocore.exceptions import ClientError
+
+from app.modules.aws_clients import Lazy, lazy_resource, lazy_table
+
+from app.modules.dynamo_scan import scan_all
+
+URL_INDEX_TABLE = "ArticleUrlTable"   # PK: urlHash (sha256(articleUrl))
+BATCH_GET_LIMIT = 100   # BatchGetItem 1회 최대 키 수
+URL_MAX_FAILED_ATTEMPTS = int(os.environ.get("URL_MAX_FAILED_ATTEMPTS", "3"))   # 본문 수집이 이만큼 실패하면 포기
+
+
+def url_hash(url: str) -> str:
+    """기사 URL → 인덱스 키 (sha256 hex)"""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+class BloomFilter:
+    """
+    프로세스 내 확률적 사전 필터
+    - 없다고 하면 확실히 없음 / 있다고 하면 error_rate 확률로 오판
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.01):
+        num_bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        self.num_bits = num_bits
+        self.num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        self._bits = bytearray((num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, key: str) -> None:
+        positions = self._positions(key)
+        with self._lock:
+            for pos in positions:
+                self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class UrlIndex:
+    """
+    기사 URL 중복 확인용 인덱스 (ArticleUrlTable + Bloom 필터)
+    - warm(): 시작 시 인덱스 테이블 전체를 읽어 Bloom 필터 적재
+    - filter_new(): Bloom 필터에 없는 URL은 바로 신규 처리, 나머지만 BatchGetItem으로 확인
+    - claim(): 조건부 쓰기로 URL 선점 (다른 인스턴스와 동시에 수집해도 중복 저장 방지)
+    - record_failure(): 본문 수집 실패 횟수 기록 (articleId 없는 행)
+      → URL_MAX_FAILED_ATTEMPTS 미만이면 계속 신규로 취급해 재시도, 이상이면 포기하고 등록된 URL 처럼 제외
+    """
+
+    def __init__(self, resource, table_name: str = URL_INDEX_TABLE):
+        self._resource = resource
+        self.table_name = table_name
+        self.table = Lazy(lambda: resource.Table(table_name))
+        self.bloom = BloomFilter()
+        self.warmed = False
+
+    def warm(self) -> int:
+        """인덱스 테이블 전체 해시를 Bloom 필터에 적재 (페이지네이션 처리)"""
+        count = 0
+        try:
+            for item in scan_all(self.table, segments=4, projection=["urlHash"]):
+                self.bloom.add(item["urlHash"])
+                count += 1
+            self.warmed = True
+            print(f"✅ URL 인덱스 적재 완료: {count}건")
+        except Exception as e:
+            print(f"⚠️ URL 인덱스 적재 실패 (DynamoDB 직접 조회로 동작): {e}")
+        return count
+
+    @staticmethod
+    def _done(item: dict) -> bool:
+        """저장된 기사(선점 포함)이거나 수집을 포기한 URL"""
+        return "articleId" in item or int(item.get("failedAttempts", 0)) >= URL_MAX_FAILED_ATTEMPTS
+
+    def _existing_hashes(self, hashes: List[str]) -> set:
+        """BatchGetItem으로 인덱스에서 더 이상 수집하지 않을 해시 조회 (재시도 대기 중인 실패 URL 은 제외)"""
+        found = set()
+        for i in range(0, len(hashes), BATCH_GET_LIMIT):
+            request = {
+                self.table_name: {
+                    "Keys": [{"urlHash": h} for h in hashes[i:i + BATCH_GET_LIMIT]],
+                    "ProjectionExpression": "urlHash, articleId, failedAttempts",
+                }
+            }
+            retry = 0
+            while request:
+                res = self._resource.batch_get_item(RequestItems=request)
+                for item in res.get("Responses", {}).get(self.table_name, []):
+                    if self._done(item):
+                        found.add(item["urlHash"])
+                request = res.get("UnprocessedKeys") or None
+                if request:
+                    retry += 1
+                    time.sleep(min(0.05 * (2 ** retry), 2.0))
+        return found
+
+    def filter_new(self, urls: Iterable[str]) -> List[str]:
+        """아직 저장되지 않은 URL만 반환 (재시도할 실패 URL 포함, 입력 순서 유지, 중복 제거)"""
+        urls = list(dict.fromkeys(urls))
+        hashes = {url: url_hash(url) for url in urls}
+
+        if self.warmed:
+            candidates = [h for h in hashes.values() if h in self.bloom]
+        else:
+            candidates = list(hashes.values())
+
+        existing = self._existing_hashes(candidates) if candidates else set()
+        for h in existing:
+            self.bloom.add(h)
+        return [url for url in urls if hashes[url] not in existing]
+
+    def claim(self, url: str, article_id: str) -> bool:
+        """URL 선점 (이미 등록된 URL이면 False, 실패 기록만 있는 URL 은 덮어씀)"""
+        h = url_hash(url)
+        try:
+            self.table.put_item(
+                Item={"urlHash": h, "articleUrl": url, "articleId": article_id},
+                ConditionExpression="attribute_not_exists(articleId)",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                self.bloom.add(h)
+                return False
+            raise
+        self.bloom.add(h)
+        return True
+
+    def record_failure(self, url: str) -> Optional[int]:
+        """
+        본문 수집 실패 1회 기록 → 누적 실패 횟수
+        (그 사이 다른 작업이 저장했으면 None)
+        """
+        h = url_hash(url)
+        try:
+            res = self.table.update_item(
+                Key={"urlHash": h},
+                UpdateExpression="SET articleUrl = :u, lastFailedAt = :t ADD failedAttempts :one",
+                ConditionExpression="attribute_not_exists(articleId)",
+                ExpressionAttributeValues={":u": url, ":t": int(time.time()), ":one": 1},
+                ReturnValues="UPDATED_NEW",
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                self.bloom.add(h)
+                return None
+            raise
+        self.bloom.add(h)
+        return int(res["Attributes"]["failedAttempts"])
+
+    def release(self, url: str) -> None:
+        """기사 저장 실패 시 선점 해제 (다음 실행에서 재시도되도록)"""
+        self.table.delete_item(Key={"urlHash": url_hash(url)})
+
+
+url_index = UrlIndex(lazy_resource("dynamodb"))
+
+
+def backfill_from_articles(article_table) -> int:
+    """
+    기존 ArticleTable의 articleUrl로 인덱스 채우기 (인덱스 도입 이전 데이터용)
+    """
+    count = 0
+    with url_index.table.batch_writer(overwrite_by_pkeys=["urlHash"]) as writer:
+        for item in scan_all(article_table, segments=4, projection=["articleId", "articleUrl"]):
+            url = item.get("articleUrl")
+            if not url:
+                continue
+            writer.put_item(Item={
+                "urlHash": url_hash(url),
+                "articleUrl": url,
+                "articleId": item["articleId"],
+            })
+            count += 1
+    return count
+
+
+# ✅ 기존 데이터 백필: python -m app.modules.url_index
+if __name__ == "__main__":
+    total = backfill_from_articles(lazy_table("ArticleTable"))
+    print(f"🎉 URL 인덱스 백필 완료: {total}건")
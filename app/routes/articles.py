@@ -1,33 +1,85 @@
 from fastapi import APIRouter, HTTPException
-import boto3
+from starlette.concurrency import run_in_threadpool
 import uuid
 import re
 from app.modules.bedrock import call_bedrock_api, parse_bedrock_output
-from app.modules.prompt_loader import load_prompt  
-from app.modules.name_mapper import load_name_map_text
-
+from app.modules.prompt_loader import get_prompt
+from app.modules.name_mapper import select_name_map_text
+from app.modules.generation_cache import generation_cache, make_cache_key, version_of
+from app.modules.aws_clients import lazy_client, lazy_table
+from app.modules.repository import ObjectStorage, articles as article_repo, news as news_repo
+from app.modules.body_store import PUBLIC_BUCKET, article_bodies, news_bodies
+from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
+from app.modules.response_cache import invalidate_news
+from app.modules.jobs import CLUSTER, Job, JobConflict, job_manager
+from app.modules.rss_writer import KST, RSS_MAX_ITEMS, Feed, category_slug, daily_feed, rfc822_kst
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+import os
+from typing import Optional
+from urllib.parse import quote
 
 router = APIRouter(prefix="/articles", tags=["Articles"])
 
 # ✅ AWS 리소스
-region = "us-east-1"
-dynamodb = boto3.resource("dynamodb", region_name=region)
-s3 = boto3.client("s3", region_name=region)
+# - 생성 로직(스레드에서 실행)은 boto3, 이벤트 루프에서 실행되는 조회/업로드는 async 저장소
+article_table = lazy_table("ArticleTable")
+news_table = lazy_table("NewsTable")
+dynamodb_client = lazy_client("dynamodb")   # TransactWriteItems (low-level API)
+_serializer = TypeSerializer()
+TARGET_BUCKET = PUBLIC_BUCKET   # 썸네일 / RSS (퍼블릭)
+feed_storage = ObjectStorage(TARGET_BUCKET)
+PUB_DAY_INDEX = "PubDayPubDateIndex"   # NewsTable GSI (pubDay, pubDate)
+# 증분 조회 시 마지막 조회 시각보다 이만큼 앞부터 다시 읽음 (조회 직전에 커밋된 뉴스 / GSI 반영 지연 대비)
+RSS_SYNC_OVERLAP_SECONDS = int(os.environ.get("RSS_SYNC_OVERLAP_SECONDS", "300"))
 
-article_table = dynamodb.Table("ArticleTable")
-news_table = dynamodb.Table("NewsTable")
-TARGET_BUCKET = "sayart-news-thumbnails"
+# 배치 생성 동시 실행 수 (실제 호출 속도는 Bedrock RPM/TPM 리미터가 조절)
+GENERATION_CONCURRENCY = int(os.environ.get("GENERATION_CONCURRENCY", "8"))
+SCAN_SEGMENTS = 4   # 전체 스캔 병렬 세그먼트 수
 
 
-@router.post("/generate-news/{article_id}")
-def generate_news_from_article(article_id: str):
-    """기사 기반으로 뉴스 생성"""
+def _serialize(values: dict) -> dict:
+    return {k: _serializer.serialize(v) for k, v in values.items()}
+
+
+def _commit_generated_news(news_item: dict, article_id: str) -> None:
+    """
+    NewsTable 저장 + ArticleTable 생성 완료 표시를 한 트랜잭션으로 기록
+    (둘 중 하나만 반영되는 경우 없음, 왕복 1회)
+    """
+    dynamodb_client.transact_write_items(TransactItems=[
+        {
+            "Put": {
+                "TableName": news_table.name,
+                "Item": _serialize(news_item),
+                "ConditionExpression": "attribute_not_exists(articleId)",
+            }
+        },
+        {
+            "Update": {
+                "TableName": article_table.name,
+                "Key": _serialize({"articleId": article_id}),
+                "UpdateExpression": "SET generatedNewsId = :nid, generateFlag = :f, generateError = :e",
+                "ConditionExpression": "attribute_exists(articleId)",
+                "ExpressionAttributeValues": _serialize({":nid": news_item["articleId"], ":f": 1, ":e": "SUCCESS"}),
+            }
+        },
+    ])
+
+
+def _generate_news(article_id: str) -> dict:
+    """
+    기사 1건 → 뉴스 생성 (블로킹: DynamoDB + Bedrock)
+    라우트에서는 스레드풀로, 배치에서는 생성 워커에서 직접 호출
+    """
     try:
         res = article_table.get_item(Key={"articleId": article_id})
         if "Item" not in res:
             raise HTTPException(status_code=404, detail="Article not found")
-        article = res["Item"]
+        article = article_bodies.unpack(res["Item"])   # 압축/S3 본문 복원
 
         category = article.get("category")
         if not category:
@@ -43,57 +95,61 @@ def generate_news_from_article(article_id: str):
 
         # 프롬프트 불러오기
         try:
-            template = load_prompt("generate_news") 
+            template = get_prompt("generate_news")
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Prompt load failed: {e}")
 
 
-        name_map_text = load_name_map_text()
-        # ✅ 템플릿 변수 치환
-        prompt = (
-            template
-            .replace("{{content}}", article.get("content", ""))
-            .replace("{{name_map}}", name_map_text)
-        )
+        content = article.get("content", "")
+        # ✅ 본문에 등장하는 이름의 매핑만 주입
+        name_map_text = select_name_map_text(content) or "(none)"
+
+        # ✅ 같은 본문 + 같은 템플릿/네임맵이면 이전 생성 결과 재사용
+        cache_key = make_cache_key(content, template.version, version_of(name_map_text))
+
+        def create():
+            # ✅ 템플릿 변수 치환 (컴파일된 템플릿 1회 조립)
+            prompt = template.render(content=content, name_map=name_map_text)
 
-        # ✅ Bedrock 호출
-        result = call_bedrock_api(prompt=prompt, model_name="haiku-3.5")
-        text = result["content"][0]["text"] if "content" in result else str(result)
-        title, description = parse_bedrock_output(text)
-        
-        
+            # ✅ Bedrock 호출
+            result = call_bedrock_api(prompt=prompt, model_name="haiku-3.5")
+            text = result["content"][0]["text"] if "content" in result else str(result)
+            title, description = parse_bedrock_output(text)
 
-        if not title or not description:
-            raise HTTPException(status_code=500, detail="Bedrock output parsing failed")
-        
-        description = re.sub(r'\n{2,}', '</p><p>', description.strip())
-        description = f"<p>{description}</p>"
+            if not title or not description:
+                raise HTTPException(status_code=500, detail="Bedrock output parsing failed")
+
+            description = re.sub(r'\n{2,}', '</p><p>', description.strip())
+            return title, f"<p>{description}</p>"
+
+        # 같은 키를 동시에 생성 중이면 (배치에 같은 보도자료가 여러 건) 첫 결과를 기다려 재사용
+        generated, cached = generation_cache.get_or_create(cache_key, create)
+        title, description = generated["title"], generated["description"]
 
 
         # ✅ 새 뉴스 생성
         new_id = str(uuid.uuid4().hex[:10])
-        now = datetime.now(timezone.utc).isoformat()
-
-        news_table.put_item(
-            Item={
-                "articleId": new_id,
-                "title": title,
-                "description": description,
-                "sourceArticleId": article_id,
-                "category": category,
-                "pubDate": now,
-                "author": "System",
-                "imageUrl": image_url,
-                "originUrl": origin_url,
-            }
-        )
+        now_dt = datetime.now(timezone.utc)
+        now = now_dt.isoformat()
 
-        # ✅ ArticleTable에 generatedNewsId 업데이트
-        article_table.update_item(
-            Key={"articleId": article_id},
-            UpdateExpression="SET generatedNewsId = :nid, generateFlag = :f",
-            ExpressionAttributeValues={":nid": new_id, ":f": 1},
-        )
+        news_item = {
+            "articleId": new_id,
+            "title": title,
+            "description": description,
+            "sourceArticleId": article_id,
+            "category": category,
+            "pubDate": now,
+            "pubDay": now_dt.astimezone(KST).strftime("%Y-%m-%d"),   # KST 기준 일자 (RSS 파티션 키)
+            "author": "System",
+            "imageUrl": image_url,
+            "originUrl": origin_url,
+        }
+        # ✅ 뉴스 저장 + ArticleTable generatedNewsId / generateFlag=1 / generateError=SUCCESS (트랜잭션 1회)
+        _commit_generated_news(news_bodies.pack(news_item), article_id)
+
+        # ✅ 당일 RSS 캐시에 증분 반영 / 카테고리 목록 응답 캐시 무효화
+        daily_feed.add(news_item["pubDay"], news_item)
+        invalidate_news(category=category, article_id=new_id)
 
         return {
             "message": "Generated successfully",
@@ -102,220 +158,231 @@ def generate_news_from_article(article_id: str):
             "description": description,
             "category": category,
             "imageUrl": image_url,
+            "cached": bool(cached),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/generate-batch")
-def generate_all_unprocessed_articles():
+@router.post("/generate-news/{article_id}")
+async def generate_news_from_article(article_id: str):
+    """기사 기반으로 뉴스 생성 (Bedrock 대기 동안 이벤트 루프는 다른 요청 처리)"""
+    return await run_in_threadpool(_generate_news, article_id)
+
+
+def _generate_and_flag(article: dict, job: Optional[Job] = None) -> dict:
     """
-    아직 뉴스가 생성되지 않은 기사들(generateFlag=0)을 모두 생성
+    기사 1건 생성 후 generateFlag 기록 (1: 성공 / 2: 실패)
+    job 이 취소됐으면 시작하지 않고 건너뜀 (플래그 그대로 → 다음 배치에서 처리)
     """
+    article_id = article["articleId"]
+
+    if job:
+        if job.cancelled:
+            job.update_item(article_id, status="skipped")
+            job.bump(field="skipped")
+            return {"articleId": article_id, "status": "skipped"}
+        job.update_item(article_id, status="running")
+
     try:
-        # 1️⃣ generateFlag == 0 인 기사 목록 조회
-        res = article_table.scan(
-            FilterExpression="attribute_not_exists(generateFlag) OR generateFlag = :flag",
-            ExpressionAttributeValues={":flag": 0}
+        # 기존 단일 생성 로직 재사용 (성공 플래그는 뉴스 저장과 같은 트랜잭션에서 기록)
+        _generate_news(article_id)
+        if job:
+            job.update_item(article_id, status="success")
+            job.bump(field="new")
+        return {"articleId": article_id, "status": "success"}
+
+    except Exception as e:
+        # 실패 시 플래그 2 및 오류내용 기록
+        article_table.update_item(
+            Key={"articleId": article_id},
+            UpdateExpression="SET generateFlag = :f, generateError = :e",
+            ExpressionAttributeValues={
+                ":f": 2,
+                ":e": str(e)
+            }
         )
-        articles = res.get("Items", [])
-        if not articles:
-            return {"message": "생성할 신규 기사 없음", "count": 0}
+        if job:
+            job.update_item(article_id, status="failed", error=str(e))
+            job.bump(field="failed")
+        return {"articleId": article_id, "status": f"failed: {e}"}
 
-        total_success = 0
-        total_fail = 0
-        results = []
 
-        for article in articles:
-            article_id = article["articleId"]
-
-            try:
-                # 기존 단일 생성 로직 재사용
-                sub_res = generate_news_from_article(article_id)
-
-                # 성공 시 플래그 1로 업데이트
-                article_table.update_item(
-                    Key={"articleId": article_id},
-                    UpdateExpression="SET generateFlag = :f, generateError = :e",
-                    ExpressionAttributeValues={
-                        ":f": 1,
-                        ":e": "SUCCESS"
-                    }
-                )
-
-                total_success += 1
-                results.append({"articleId": article_id, "status": "success"})
-
-            except Exception as e:
-                # 실패 시 플래그 2 및 오류내용 기록
-                article_table.update_item(
-                    Key={"articleId": article_id},
-                    UpdateExpression="SET generateFlag = :f, generateError = :e",
-                    ExpressionAttributeValues={
-                        ":f": 2,
-                        ":e": str(e)
-                    }
-                )
-
-                total_fail += 1
-                results.append({"articleId": article_id, "status": f"failed: {e}"})
+@router.post("/generate-batch", status_code=202)
+async def generate_all_unprocessed_articles():
+    """
+    배치 생성 작업 등록 → 작업 ID 바로 반환 (진행 상황: GET /jobs/{jobId}, 취소: POST /jobs/{jobId}/cancel)
+    """
+    try:
+        # 인스턴스 전체에서 1개만 (종류별 리스)
+        job = await job_manager.submit("generate-batch", _run_generate_batch, exclusive=CLUSTER)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=f"Batch generation already running (job {e.job_id})")
+    return {"jobId": job.id, "status": job.status, "statusUrl": f"/jobs/{job.id}"}
 
-        return {
-            "message": "Batch generation completed",
-            "totalSuccess": total_success,
-            "totalFail": total_fail,
-            "processed": len(articles),
-            "results": results
-        }
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+async def _run_generate_batch(job: Job) -> dict:
+    """
+    아직 뉴스가 생성되지 않은 기사들(generateFlag=0)을 모두 생성
+    - GENERATION_CONCURRENCY 개씩 동시 생성, Bedrock 쿼터 초과 시 자동 감속
+    - 기사별 상태 / new·failed·skipped 합계를 job 에 기록
+    """
+    # 1️⃣ generateFlag == 0 인 기사 목록 조회
+    articles = [item async for item in article_repo.scan_all(
+        segments=SCAN_SEGMENTS,
+        projection=["articleId"],
+        FilterExpression="attribute_not_exists(generateFlag) OR generateFlag = :flag",
+        ExpressionAttributeValues={":flag": 0},
+    )]
+    job.bump(field="total", n=len(articles))
+    if not articles:
+        return {"message": "생성할 신규 기사 없음", "count": 0}
+
+    # 2️⃣ Bedrock 쿼터 범위 안에서 동시 생성 (속도 제한은 call_bedrock_api 에서 처리)
+    loop = asyncio.get_running_loop()
+    pool = ThreadPoolExecutor(max_workers=GENERATION_CONCURRENCY, thread_name_prefix="generate")
+    try:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, _generate_and_flag, article, job) for article in articles
+        ))
+    finally:
+        # 취소 시 대기 중인 기사는 버리고, 진행 중인 생성은 끝나는 대로 종료 (이벤트 루프는 기다리지 않음)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    total_success = sum(1 for r in results if r["status"] == "success")
+    total_fail = len(results) - total_success
+
+    return {
+        "message": "Batch generation completed",
+        "totalSuccess": total_success,
+        "totalFail": total_fail,
+        "processed": len(articles),
+        "results": results
+    }
+
+
+RSS_HASH_METADATA = "content-sha256"   # S3 사용자 메타데이터 (x-amz-meta-content-sha256)
+
+
+def _feed_key(category: Optional[str], day: str) -> str:
+    if category is None:
+        return f"rss/ArtNews_{day}.xml"
+    return f"rss/{category_slug(category)}/ArtNews_{day}.xml"
+
+
+def _feed_url(key: str) -> str:
+    """공개 URL (한글 카테고리 경로는 퍼센트 인코딩)"""
+    return f"https://{TARGET_BUCKET}.s3.amazonaws.com/{quote(key, safe='/')}"
+
+
+async def _stored_digest(key: str):
+    """업로드된 피드의 내용 해시 (없으면 None)"""
+    head = await feed_storage.head(key)
+    return (head or {}).get("Metadata", {}).get(RSS_HASH_METADATA)
+
+
+async def _upload_feed(feed: Feed, key: str, with_gzip: bool) -> bool:
+    """
+    내용 해시가 저장된 객체와 같으면 업로드 생략
+    (빌드 시각만 다른 피드는 같은 내용으로 취급)
+    Returns: 업로드 여부
+    """
+    gz_key = key + ".gz"
+    if await _stored_digest(key) == feed.digest and (not with_gzip or await _stored_digest(gz_key) == feed.digest):
+        return False
+
+    metadata = {RSS_HASH_METADATA: feed.digest}
+    await feed_storage.put(
+        key,
+        feed.body,
+        ContentType="application/rss+xml; charset=utf-8",
+        Metadata=metadata,
+    )
+    if with_gzip:
+        await feed_storage.put(
+            gz_key,
+            feed.gzipped(),
+            ContentType="application/rss+xml; charset=utf-8",
+            ContentEncoding="gzip",
+            Metadata=metadata,
+        )
+    return True
+
+
+async def _query_pub_day(day: str, pub_date_condition=None) -> list:
+    """당일(KST) 파티션 최신순 최대 RSS_MAX_ITEMS 개 (pub_date_condition: pubDate 정렬키 조건)"""
+    condition = Key("pubDay").eq(day)
+    if pub_date_condition is not None:
+        condition = condition & pub_date_condition
+    res = await news_repo.query(
+        IndexName=PUB_DAY_INDEX,
+        KeyConditionExpression=condition,
+        ScanIndexForward=False,
+        Limit=RSS_MAX_ITEMS,
+    )
+    return await news_bodies.aunpack_all(res.get("Items", []))
 
 
 @router.get("/rss/generated")
-def generate_and_upload_rss_to_s3():
+async def generate_and_upload_rss_to_s3(incremental: bool = False, gzip: bool = False):
     """
     오늘 생성된 뉴스 기반 RSS XML 생성 → S3 업로드 (퍼블릭)
     
-    (xml.etree.ElementTree → xml.dom.minidom 기반으로 교체하여 진짜 CDATA 적용)
+    - 스트리밍 직렬화 (xml.dom.minidom toprettyxml 과 동일한 CDATA / 네임스페이스 / BOM 출력)
+    - incremental=true: 이 인스턴스에 당일 피드 캐시가 있으면 파티션 전체 대신
+      마지막 조회 이후 pubDate 만 조회해서 병합 (다른 인스턴스가 생성한 뉴스도 반영)
+    - 한 번의 순회로 전체 피드 + 카테고리별 피드 생성 (rss/{category}/ArtNews_{날짜}.xml)
+    - 내용 해시가 S3 에 저장된 것과 같으면 업로드 생략
+    - gzip=true: 미리 압축한 .xml.gz 도 함께 업로드
     """
     try:
-        from xml.dom.minidom import Document
-
-        KST = timezone(timedelta(hours=9))
         now_kst = datetime.now(KST)
         today_kst_str = now_kst.strftime("%Y-%m-%d")
 
-        # 1️⃣ DynamoDB 뉴스 스캔
-        res = news_table.scan()
-        items = res.get("Items", [])
-
-        # 2️⃣ 오늘 생성된 뉴스만 필터링
-        recent_items = []
-        for item in items:
-            pub_date_str = item.get("pubDate", "")
-            if not pub_date_str:
-                continue
-            try:
-                pub_dt = datetime.fromisoformat(pub_date_str.replace("Z", "+00:00")).astimezone(KST)
-                if pub_dt.strftime("%Y-%m-%d") == today_kst_str:
-                    recent_items.append(item)
-            except Exception:
-                continue
-
-        # 3️⃣ 최신순 정렬 + 최대 100개
-        recent_items.sort(key=lambda x: x.get("pubDate", ""), reverse=True)
-        recent_items = recent_items[:100]
-
-        # 4️⃣ DOM 기반 RSS XML 생성
-        doc = Document()
-
-        rss = doc.createElement("rss")
-        rss.setAttribute("xmlns:atom", "http://www.w3.org/2005/Atom")
-        rss.setAttribute("xmlns:art", "http://artnews.local/rss")
-        rss.setAttribute("version", "2.0")
-        doc.appendChild(rss)
-        # script = doc.createElement("script")
-        # rss.appendChild(script)
-
-        channel = doc.createElement("channel")
-        rss.appendChild(channel)
-
-        def add_text(tag, text):
-            el = doc.createElement(tag)
-            el.appendChild(doc.createTextNode(text))
-            channel.appendChild(el)
-            return el
-
-        add_text("title", "ArtNews Recent Articles")
-        add_text("link", "http://cc.xxq.me/art_news/rss.xml")
-        add_text("description", "오늘 생성된 아트 기사 목록")
-        add_text("language", "ko")
-        
-        pub_str = now_kst.strftime("%a, %d %b %Y %H:%M:%S +0900")
-        add_text("pubDate", pub_str)
-        add_text("lastBuildDate", pub_str)
-
-        atom_link = doc.createElement("atom:link")
-        atom_link.setAttribute("href", "http://cc.xxq.me/art_news/rss.xml")
-        atom_link.setAttribute("rel", "self")
-        atom_link.setAttribute("type", "application/rss+xml")
-        channel.appendChild(atom_link)
-
-        byline = '''\n\nSayArt / Sayart Teams'''
-
-        # 5️⃣ 아이템 루프
-        for item in recent_items:
-            item_el = doc.createElement("item")
-            channel.appendChild(item_el)
-
-            # 진짜 CDATA 블록 생성
-            def add_cdata(tag, text):
-                el = doc.createElement(tag)
-                el.appendChild(doc.createCDATASection(text))
-                item_el.appendChild(el)
-
-            add_cdata("title", item.get("title", "Untitled"))
-            link_el = doc.createElement("link")
-            link_el.appendChild(doc.createTextNode(item.get("originUrl", "")))
-            item_el.appendChild(link_el)
-            add_cdata("description", item.get("description", "") + byline)
-            add_cdata("category", item.get("category", "general"))
-
-            # articleId (namespace 포함)
-            # TODO: 수정필요 임시 하드코드 ( 어떻게 변할지 몰라서 )
-            art_id = doc.createElement("art:articleId")
-            # art_id.appendChild(doc.createTextNode(str(item.get("articleId", ""))))
-            art_id.appendChild(doc.createTextNode(str(182012122)))
-            item_el.appendChild(art_id)
-
-            guid_el = doc.createElement("guid")
-            guid_el.setAttribute("isPermaLink", "false")
-            guid_el.appendChild(doc.createTextNode(item.get("articleId", "")))
-            item_el.appendChild(guid_el)
-            
-
-            # imageUrl (첫 번째 이미지만)
-            if item.get("imageUrl"):
-                img_el = doc.createElement("imageUrl")
-                img_el.appendChild(doc.createTextNode(item["imageUrl"]))
-                item_el.appendChild(img_el)
-
-            # pubDate (RFC 형식 변환)
-            pub_dt = datetime.fromisoformat(
-                item.get("pubDate", now_kst.isoformat())
-            ).astimezone(KST)
-            pub_date_str = pub_dt.strftime("%a, %d %b %Y %H:%M:%S +0900")
-            pub_el = doc.createElement("pubDate")
-            pub_el.appendChild(doc.createTextNode(pub_date_str))
-            item_el.appendChild(pub_el)
-
-        # 6️⃣ XML 문자열 직렬화 (UTF-8)
-        xml_bytes = doc.toprettyxml(indent="  ", encoding="utf-8")
-        
-        # BOM 추가
-        BOM = b'\xef\xbb\xbf'
-        xml_bytes = BOM + xml_bytes
-
-        # 7️⃣ S3 업로드 (퍼블릭)
-        file_name = f"rss/ArtNews_{today_kst_str}.xml"
-        s3.put_object(
-            Bucket=TARGET_BUCKET,
-            Key=file_name,
-            Body=xml_bytes,
-            ContentType="application/rss+xml; charset=utf-8",
-        )
+        synced_at = datetime.now(timezone.utc)
+        if incremental and daily_feed.is_warm(today_kst_str):
+            # 1️⃣ 마지막 조회 이후 생성분만 조회해서 병합 (다른 인스턴스가 생성한 뉴스 포함)
+            since = datetime.fromisoformat(daily_feed.synced_at) - timedelta(seconds=RSS_SYNC_OVERLAP_SECONDS)
+            items = await _query_pub_day(today_kst_str, Key("pubDate").gte(since.isoformat()))
+            daily_feed.merge(today_kst_str, items, synced_at.isoformat())
+        else:
+            # 1️⃣ 오늘(KST) 파티션만 조회 → 2️⃣ pubDate 최신순 / 최대 100개 (GSI 정렬 그대로 사용)
+            items = await _query_pub_day(today_kst_str)
+            daily_feed.reset(today_kst_str, items, synced_at.isoformat())
 
-        public_url = f"https://{TARGET_BUCKET}.s3.amazonaws.com/{file_name}"
+        # 3️⃣ RSS XML 직렬화 (UTF-8 + BOM) — 전체 + 카테고리별
+        feeds = daily_feed.feeds(
+            now_kst, category_link=lambda category: _feed_url(_feed_key(category, today_kst_str)))
+        pub_str = rfc822_kst(now_kst)
+
+        # 4️⃣ 바뀐 피드만 S3 업로드 (퍼블릭)
+        results = []
+        for feed in feeds:
+            file_name = _feed_key(feed.category, today_kst_str)
+            results.append({
+                "category": feed.category,
+                "itemCount": feed.item_count,
+                "rssFile": file_name,
+                "rssUrl": _feed_url(file_name),
+                "uploaded": await _upload_feed(feed, file_name, gzip),
+            })
+
+        combined = results[0]
+        uploaded = sum(1 for r in results if r["uploaded"])
 
         # ✅ 반환: RSS 업로드 정보만
         return {
             "message": "RSS generated and uploaded successfully",
-            "itemCount": len(recent_items),
-            "rssFile": file_name,
-            "rssUrl": public_url,
+            "itemCount": combined["itemCount"],
+            "rssFile": combined["rssFile"],
+            "rssUrl": combined["rssUrl"],
             "generatedAt": pub_str,
+            "feeds": results,
+            "uploadedCount": uploaded,
+            "skippedCount": len(results) - uploaded,
         }
 
     except Exception as e:
@@ -0,0 +1,42 @@
+from fastapi import APIRouter, HTTPException
+from typing import Optional
+from app.modules.jobs import job_manager
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.get("")
+async def list_jobs(kind: Optional[str] = None):
+    """작업 목록 (전체 인스턴스, 최신순, 항목별 상세 제외)"""
+    try:
+        items = await job_manager.describe_all(kind)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    return {"count": len(items), "items": items}
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 + 진행 카운터 (수집처/기사별 상세는 실행 중인 인스턴스 또는 종료 후 조회 시)"""
+    try:
+        job = await job_manager.describe(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """
+    작업 취소 (대기 중이면 즉시, 실행 중이면 진행 중인 항목까지만 처리하고 중단)
+    다른 인스턴스에서 실행 중이면 취소 표시 → 해당 인스턴스가 다음 상태 동기화 때 중단
+    """
+    try:
+        job = await job_manager.request_cancel(job_id)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"message": "Cancel requested", "jobId": job["jobId"], "status": job["status"]}
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, HTTPException, Body
 from pydantic import BaseModel
+from typing import Optional
 from app.modules.name_mapper import (
+    name_map_store,
     load_name_map_text,
     append_name_entry,
     overwrite_name_map,
@@ -22,6 +24,15 @@ def get_all_lines():
     return {"content": text}
 
 
+@router.get("/lookup")
+def lookup_entry(korean: Optional[str] = None, english: Optional[str] = None):
+    """한글명 또는 영문명(대소문자 무시)으로 매핑 라인 조회"""
+    if not korean and not english:
+        raise HTTPException(status_code=400, detail="korean 또는 english 중 하나는 필요합니다.")
+    lines = name_map_store.find_korean(korean) if korean else name_map_store.find_english(english)
+    return {"count": len(lines), "entries": lines, "version": name_map_store.version}
+
+
 @router.post("")
 def add_new_entry(entry: NameEntry):
     """새 항목 추가 (중복 허용)"""
@@ -1,47 +1,82 @@
-from fastapi import APIRouter, HTTPException
-import boto3
-from boto3.dynamodb.conditions import Attr
-import xml.etree.ElementTree as ET
+from fastapi import APIRouter, HTTPException, Query, Request
+from typing import Optional
+from boto3.dynamodb.conditions import Key
+from app.modules.pagination import decode_cursor, encode_cursor
+from app.modules.dynamo_scan import projection_kwargs, select_fields
+from app.modules.repository import news as news_repo
+from app.modules.body_store import news_bodies
+from app.modules.response_cache import NEWS_ARTICLE, NEWS_CATEGORY, response_cache
 
 router = APIRouter(
     prefix="/news",
     tags=["News Articles"]
 )
 
-# ✅ us-east-1 리전 DynamoDB (현재 구조)
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-news_table = dynamodb.Table("NewsTable")
+# ✅ NewsTable (async 저장소, us-east-1)
+CATEGORY_INDEX = "CategoryPubDateIndex"   # GSI (category, pubDate)
+SUMMARY_FIELDS = ("articleId", "title", "category", "pubDate", "imageUrl")   # view=summary (본문 제외)
 
 
 @router.get("/category/{category}")
-def get_articles_by_category(category: str):
+async def get_articles_by_category(
+    category: str,
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="최대 반환 개수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값"),
+    fields: Optional[str] = Query(None, description="가져올 속성 (쉼표 구분, articleId 는 항상 포함)"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: 본문 제외 목록용 속성만"),
+):
     """
     ✅ 카테고리별 뉴스 목록 (pubDate 내림차순 정렬)
+    - CategoryPubDateIndex GSI Query 1회로 최신 limit 개 조회
+    - 다음 페이지가 있으면 X-Next-Cursor 헤더로 커서 반환
+    - 응답 캐시 (뉴스 생성 시 해당 카테고리 무효화) + ETag / If-None-Match → 304
+    - fields= / view=summary: ProjectionExpression 으로 필요한 속성만 조회 (본문 제외 시 응답 크기 대폭 감소)
     """
     try:
-        # GSI가 없기 때문에 scan + filter 사용
-        response = news_table.scan(
-            FilterExpression=Attr("category").eq(category)
-        )
-        items = response.get("Items", [])
+        kwargs = {
+            "IndexName": CATEGORY_INDEX,
+            "KeyConditionExpression": Key("category").eq(category),
+            "ScanIndexForward": False,   # pubDate 내림차순
+            "Limit": limit,
+        }
+        selected = select_fields(fields, view, SUMMARY_FIELDS, keys=["articleId"])
+        kwargs.update(projection_kwargs(news_bodies.projection(selected)))
+        if cursor:
+            try:
+                kwargs["ExclusiveStartKey"] = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
 
-        # pubDate 기준 내림차순 정렬
-        items.sort(key=lambda x: x.get("pubDate", ""), reverse=True)
+        async def load():
+            res = await news_repo.query(**kwargs)
+            next_cursor = encode_cursor(res.get("LastEvaluatedKey"))
+            items = await news_bodies.aunpack_all(res.get("Items", []))
+            return items, ({"X-Next-Cursor": next_cursor} if next_cursor else None)
 
-        return items
+        cached = await response_cache.aget_or_load(NEWS_CATEGORY, (category, limit, cursor, tuple(selected or ())), load, tag=category)
+        return cached.to_response(request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/article/{article_id}")
-def get_article_detail(article_id: str):
+async def get_article_detail(article_id: str, request: Request):
     """
-    ✅ 단일 뉴스 상세 조회
+    ✅ 단일 뉴스 상세 조회 (응답 캐시 + ETag)
     """
     try:
-        response = news_table.get_item(Key={"articleId": article_id})
-        if "Item" not in response:
-            raise HTTPException(status_code=404, detail=f"Article not found: {article_id}")
-        return response["Item"]
+        async def load():
+            item = await news_repo.get({"articleId": article_id})
+            if item is None:
+                raise HTTPException(status_code=404, detail=f"Article not found: {article_id}")
+            return await news_bodies.aunpack(item), None
+
+        cached = await response_cache.aget_or_load(NEWS_ARTICLE, article_id, load)
+        return cached.to_response(request)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
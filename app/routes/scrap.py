@@ -1,139 +1,434 @@
 from fastapi import APIRouter, HTTPException
 from datetime import datetime
-import boto3
+from typing import Optional
+import asyncio
+import os
+import time
 import uuid
 import traceback
-from app.modules.crawling import extract_links, get_contents
+from app.modules.crawling import fetch_listing, get_contents
+from app.modules.crawl_engine import CrawlEngine
+from app.modules.url_index import URL_MAX_FAILED_ATTEMPTS, url_index
+from app.modules.aws_clients import get_resource, lazy_table
+from app.modules.repository import ARTICLE_TABLE, sources as source_repo
+from app.modules.body_store import article_bodies
+from app.modules.response_cache import invalidate_sources
+from app.modules.jobs import INSTANCE, Job, JobConflict, job_manager
+from app.modules.leases import Lease, scrap_leases, source_lease_key
+from app.modules.poll_schedule import is_due, next_schedule
 
 router = APIRouter(prefix="/scrap", tags=["Scraper"])
 
 # DynamoDB
-region = "us-east-1"
-dynamodb = boto3.resource("dynamodb", region_name=region)
-source_table = dynamodb.Table("SourceMetaTable")
-article_table = dynamodb.Table("ArticleTable")
-lock_table = dynamodb.Table("ScrapLockTable")  # ✅ 락용 테이블 추가 (PK: "scrap-lock")
+source_table = lazy_table("SourceMetaTable")
+article_table = lazy_table(ARTICLE_TABLE)
 
+# 동시 수집 제한
+SCRAP_MAX_CONCURRENCY = int(os.environ.get("SCRAP_MAX_CONCURRENCY", "16"))             # 전체 동시 요청 수
+SCRAP_PER_HOST_CONCURRENCY = int(os.environ.get("SCRAP_PER_HOST_CONCURRENCY", "2"))    # 수집처 호스트별 동시 요청 수
+ARTICLE_FLUSH_SIZE = 25   # BatchWriteItem 1회 최대 건수
 
-@router.post("/run")
-def run_scraper():
+
+def _resolve_url(base_url: str, link: str) -> str:
+    """목록에서 얻은 링크를 절대 URL로 변환"""
+    if link.startswith("/"):
+        return base_url.rstrip("/") + link
+    if link.startswith("http"):
+        return link
+    return f"{base_url.rstrip('/')}/{link}"
+
+
+def _save_listing_state(src_id: str, listing: dict) -> None:
+    """다음 실행의 조건부 요청용 ETag / Last-Modified / 목록 지문 저장"""
+    values = {
+        ":e": listing.get("etag"),
+        ":m": listing.get("lastModified"),
+        ":f": listing.get("fingerprint"),
+        ":t": datetime.utcnow().isoformat(),
+    }
+    source_table.update_item(
+        Key={"sourceId": src_id},
+        UpdateExpression="SET listingEtag=:e, listingLastModified=:m, listingFingerprint=:f, listingCheckedAt=:t",
+        ExpressionAttributeValues=values,
+    )
+
+
+def _save_schedule(src: dict, new_articles: Optional[int], failed: int = 0) -> dict:
+    """수집 결과로 다음 수집 일정 계산 후 저장 (nextDueAt / pollIntervalSec / newRate ...)"""
+    values = next_schedule(src, new_articles, failed)
+    names = {f"#s{i}": k for i, k in enumerate(values)}
+    source_table.update_item(
+        Key={"sourceId": src["sourceId"]},
+        UpdateExpression="SET " + ", ".join(f"{alias} = :s{i}" for i, alias in enumerate(names)),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues={f":s{i}": v for i, v in enumerate(values.values())},
+    )
+    return values
+
+
+def _write_articles(items: list) -> None:
+    """batch_writer 로 일괄 저장 (25건 단위 BatchWriteItem, UnprocessedItems 는 자동 재시도, 본문은 압축/S3 이동)"""
+    with article_table.batch_writer() as writer:
+        for item in items:
+            writer.put_item(Item=article_bodies.pack(item))
+
+
+def _claim_urls(items: list) -> list:
+    """URL 선점 → 선점에 성공한 기사만 반환 (다른 수집 작업이 먼저 가져간 URL 은 제외)"""
+    return [item for item in items if url_index.claim(item["articleUrl"], item["articleId"])]
+
+
+def _unwritten_articles(items: list) -> list:
+    """저장 실패 후 ArticleTable 에 실제로 없는 기사만 반환 (batch_writer 가 중간까지 저장했을 수 있음)"""
+    request = {
+        ARTICLE_TABLE: {
+            "Keys": [{"articleId": item["articleId"]} for item in items],
+            "ProjectionExpression": "articleId",
+        }
+    }
+    found = set()
+    resource = get_resource("dynamodb")
+    retry = 0
+    while request:
+        res = resource.batch_get_item(RequestItems=request)
+        found.update(row["articleId"] for row in res.get("Responses", {}).get(ARTICLE_TABLE, []))
+        request = res.get("UnprocessedKeys") or None
+        if request:
+            retry += 1
+            time.sleep(min(0.05 * (2 ** retry), 2.0))
+    return [item for item in items if item["articleId"] not in found]
+
+
+class _ArticleWriteBuffer:
+    """
+    신규 기사를 모아 flush_size 건마다 batch_writer 로 저장
+    - URL 선점은 저장 직전에 묶음 단위로 (버퍼에 있는 동안 프로세스가 죽어도 선점만 남는 URL 없음
+      → 목록 상태도 저장되지 않으므로 다음 실행에서 다시 수집)
+    - 저장에 실패하면 실제로 저장되지 않은 기사의 선점만 해제 (이미 저장된 기사는 중복 수집되지 않도록 유지)
+    """
+
+    def __init__(self, engine: CrawlEngine, src_id: str, job: Optional[Job] = None,
+                 flush_size: int = ARTICLE_FLUSH_SIZE):
+        self.engine = engine
+        self.src_id = src_id
+        self.job = job
+        self.flush_size = flush_size
+        self.written = 0
+        self.skipped = 0
+        self.failed = 0
+        self._items: list = []
+
+    async def add(self, item: dict) -> None:
+        self._items.append(item)
+        if len(self._items) >= self.flush_size:
+            await self.flush()
+
+    def _count(self, field: str, n: int) -> None:
+        """written / skipped / failed 집계 (job 카운터 이름은 new / skipped / failed)"""
+        if not n:
+            return
+        attr = "written" if field == "new" else field
+        setattr(self, attr, getattr(self, attr) + n)
+        if self.job:
+            self.job.bump(self.src_id, field, n)
+
+    async def flush(self) -> None:
+        chunk, self._items = self._items, []
+        if not chunk:
+            return
+        try:
+            claimed = await self.engine.offload(_claim_urls, chunk)
+        except Exception as e:
+            # 선점 도중 실패: 선점된 URL 은 저장 없이 남지 않도록 해제 대상에 포함
+            print(f"⚠️ [{self.src_id}] URL 선점 실패: {e}")
+            await self._release(chunk)
+            self._count("failed", len(chunk))
+            return
+        self._count("skipped", len(chunk) - len(claimed))
+        if not claimed:
+            return
+        try:
+            await self.engine.offload(_write_articles, claimed)
+        except Exception as e:
+            print(f"⚠️ [{self.src_id}] 기사 {len(claimed)}건 저장 실패: {e}")
+            try:
+                unwritten = await self.engine.offload(_unwritten_articles, claimed)
+            except Exception as check_err:
+                # 저장 여부를 확인할 수 없으면 선점 유지 (중복 저장보다 누락 확인이 쉬움)
+                print(f"⚠️ [{self.src_id}] 저장 여부 확인 실패, 선점 유지: {check_err}")
+                self._count("failed", len(claimed))
+                return
+            await self._release(unwritten)
+            self._count("new", len(claimed) - len(unwritten))
+            self._count("failed", len(unwritten))
+            return
+        self._count("new", len(claimed))
+
+    async def _release(self, items: list) -> None:
+        for item in items:
+            try:
+                await self.engine.offload(url_index.release, item["articleUrl"])
+            except Exception as release_err:
+                print(f"⚠️ URL 선점 해제 실패 ({item['articleUrl']}): {release_err}")
+
+
+def _empty_summary(src: dict, listing_status: str) -> dict:
+    return {
+        "sourceId": src["sourceId"],
+        "sourceName": src["srcName"],
+        "listingStatus": listing_status,
+        "checkedLinks": 0,
+        "newArticles": 0,
+        "skipped": 0,
+        "failed": 0,
+        "gaveUp": 0,
+    }
+
+
+async def _crawl_source(engine: CrawlEngine, src: dict, force: bool = False,
+                        job: Optional[Job] = None) -> Optional[dict]:
+    """
+    수집처 리스를 잡은 경우에만 수집 (다른 인스턴스가 보유 중이면 listingStatus="leased" 로 건너뜀)
+    → 여러 인스턴스가 동시에 실행돼도 수집처 단위로 나눠서 처리
+    """
+    async with scrap_leases.hold(source_lease_key(src["sourceId"])) as lease:
+        if lease is None:
+            print(f"⏭️ [{src['srcName']}] 다른 인스턴스에서 수집 중")
+            if job:
+                job.update_item(src["sourceId"], sourceName=src["srcName"], status="leased")
+            return _empty_summary(src, "leased")
+        summary = await _crawl_leased_source(engine, src, lease, force, job)
+
+        # 다음 수집 일정 (리스를 잃었으면 가져간 인스턴스가 기록)
+        if not lease.lost:
+            try:
+                schedule = await engine.offload(
+                    _save_schedule, src,
+                    summary["newArticles"] if summary else None,
+                    summary["failed"] if summary else 0,
+                )
+                if summary:
+                    summary["nextDueAt"] = schedule["nextDueAt"]
+                    summary["pollIntervalSec"] = schedule["pollIntervalSec"]
+            except Exception as e:
+                print(f"⚠️ [{src['srcName']}] 수집 일정 저장 실패: {e}")
+        return summary
+
+
+async def _crawl_leased_source(engine: CrawlEngine, src: dict, lease: Lease, force: bool = False,
+                               job: Optional[Job] = None) -> Optional[dict]:
+    """
+    수집처 1곳 처리: 목록 링크 추출 → 신규 링크 본문을 동시에 수집/저장
+    - 목록 페이지가 304 이거나 목록 영역 지문이 같으면 링크 추출 생략
+    - force=True 면 저장된 ETag/지문 무시
+    - job 이 있으면 수집처별 new/skipped/failed 카운터를 진행 중에 갱신
+    - 리스를 잃으면 남은 링크는 처리하지 않고 목록 상태도 저장하지 않음 (다음 실행에서 재시도)
+    링크 추출 자체가 실패하면 None 반환
+    """
+    src_id = src["sourceId"]
+    src_name = src["srcName"]
+    base_url = src["sourceUrl"]
+    selector_container = src.get("selectorContainer")
+    selector_item = src.get("selectorItem", "a")
+    selector_content = src.get("contentSelector")
+    category = src.get("category", "General")
+
+    print(f"🕷️ {src_name} ({src_id}) → {base_url}")
+    if job:
+        job.update_item(src_id, sourceName=src_name, status="listing")
+
+    try:
+        listing = await engine.fetch(
+            base_url, fetch_listing, base_url, selector_container, selector_item,
+            etag=None if force else src.get("listingEtag"),
+            last_modified=None if force else src.get("listingLastModified"),
+            fingerprint=None if force else src.get("listingFingerprint"),
+        )
+    except Exception as e:
+        print(f"⚠️ [{src_name}] 링크 추출 실패: {e}")
+        if job:
+            job.update_item(src_id, status="failed", error=str(e))
+            job.bump(src_id, "failed")
+        return None
+
+    if listing["status"] != "changed":
+        print(f"⏭️ [{src_name}] 목록 변경 없음 ({listing['status']})")
+        if listing["status"] == "unchanged":
+            # 본문은 같지만 ETag가 새로 발급됐을 수 있으므로 갱신
+            try:
+                await engine.offload(_save_listing_state, src_id, listing)
+            except Exception as e:
+                print(f"⚠️ [{src_name}] 목록 상태 저장 실패: {e}")
+        if job:
+            job.update_item(src_id, status=listing["status"])
+        return _empty_summary(src, listing["status"])
+
+    links = listing["links"]
+
+    # 중복 확인 (URL 인덱스 일괄 조회)
+    full_urls = list(dict.fromkeys(_resolve_url(base_url, link) for link in links))
+    new_urls = await engine.offload(url_index.filter_new, full_urls)
+    skip_count = len(full_urls) - len(new_urls)
+    if job:
+        job.update_item(src_id, status="crawling", checkedLinks=len(links))
+        job.bump(src_id, "skipped", skip_count)
+
+    buffer = _ArticleWriteBuffer(engine, src_id, job)
+
+    async def process_link(full_url: str) -> str:
+        status = await _process_link(full_url)
+        if job and status != "buffered":   # 저장 대기 건은 flush 결과로 집계
+            job.bump(src_id, status)
+        return status
+
+    async def _process_link(full_url: str) -> str:
+        if lease.lost:
+            return "aborted"
+        try:
+            # ✅ 본문 selector를 동적으로 전달
+            data = await engine.fetch(
+                full_url, get_contents, full_url, selector_content,
+                early_stop=bool(src.get("contentEarlyStop")),
+            )
+            html = data.get("html", "")
+            imgs = data.get("images", [])
+            # data URI 는 다운로드 중 제거되므로 src 가 남아 있는 첫 이미지 사용
+            image_url = next((img["src"] for img in imgs if img.get("src")), None)
+
+            # URL 선점은 저장 직전 buffer.flush() 에서 (다른 수집 작업이 먼저 가져갔으면 skipped 로 집계)
+            await buffer.add({
+                "articleId": f"{src_id}-{uuid.uuid4().hex[:10]}",
+                "sourceId": src_id,
+                "articleUrl": full_url,
+                "content": html,
+                "imageUrl": image_url,
+                "date": datetime.utcnow().isoformat(),
+                "category": category,
+                "contentSelector": selector_content,
+            })
+            return "buffered"
+
+        except Exception as e:
+            print(f"⚠️ [{src_name}] {full_url} 수집 실패: {e}")
+            return await _record_failure(full_url)
+
+    async def _record_failure(full_url: str) -> str:
+        """
+        URL 별 실패 횟수 기록 → URL_MAX_FAILED_ATTEMPTS 에 도달하면 gaveUp (다음부터 수집 대상에서 제외)
+        영구적으로 깨진 링크 하나 때문에 목록 상태 저장 / 주기 백오프가 계속 막히지 않도록
+        """
+        try:
+            attempts = await engine.offload(url_index.record_failure, full_url)
+        except Exception as e:
+            print(f"⚠️ [{src_name}] {full_url} 실패 횟수 기록 실패: {e}")
+            return "failed"
+        if attempts is None:   # 그 사이 다른 작업이 저장
+            return "skipped"
+        if attempts >= URL_MAX_FAILED_ATTEMPTS:
+            print(f"🚫 [{src_name}] {full_url} {attempts}회 실패 → 수집 포기")
+            return "gaveUp"
+        return "failed"
+
+    try:
+        statuses = await asyncio.gather(*(process_link(url) for url in new_urls))
+    finally:
+        # 남은 기사 저장 (취소된 경우에도 이미 선점한 URL 이 저장 없이 남지 않도록)
+        await buffer.flush()
+    failed = statuses.count("failed") + buffer.failed
+
+    # 재시도할 실패 기사가 있거나 리스를 잃었으면 지문을 갱신하지 않아 다음 실행에서 재시도
+    # (포기한 URL(gaveUp)만 남았으면 저장 → 조건부 요청 / 주기 백오프 재개)
+    if not failed and not lease.lost:
+        try:
+            await engine.offload(_save_listing_state, src_id, listing)
+        except Exception as e:
+            print(f"⚠️ [{src_name}] 목록 상태 저장 실패: {e}")
+
+    if job:
+        job.update_item(src_id, status="lost" if lease.lost else "done")
+    return {
+        "sourceId": src_id,
+        "sourceName": src_name,
+        "listingStatus": listing["status"],
+        "checkedLinks": len(links),
+        "newArticles": buffer.written,
+        "skipped": skip_count + buffer.skipped + statuses.count("skipped"),
+        "failed": failed,
+        "gaveUp": statuses.count("gaveUp"),
+    }
+
+
+async def _crawl_all(sources: list, force: bool = False, job: Optional[Job] = None) -> list:
+    """모든 수집처를 동시에 수집 (전체/호스트별 동시성 제한 적용)"""
+    async with CrawlEngine(SCRAP_MAX_CONCURRENCY, SCRAP_PER_HOST_CONCURRENCY) as engine:
+        return await asyncio.gather(*(_crawl_source(engine, src, force, job) for src in sources))
+
+
+@router.post("/run", status_code=202)
+async def run_scraper(force: bool = False):
+    """
+    수집 작업 등록 → 작업 ID 바로 반환 (진행 상황: GET /jobs/{jobId}, 취소: POST /jobs/{jobId}/cancel)
+    - 기본: 수집 주기가 돌아온(nextDueAt 이 지난) 수집처만 수집 → 주기적으로 호출하는 tick
+    - force=true: 일정 / 목록 조건부 요청 상태를 무시하고 전체 수집
+    """
+    try:
+        # 이 인스턴스에서만 1개 (인스턴스 간에는 수집처별 리스로 수집처를 나눠 가짐)
+        job = await job_manager.submit("scrap", lambda job: _run_scraper(job, force), {"force": force},
+                                       exclusive=INSTANCE)
+    except JobConflict as e:
+        raise HTTPException(status_code=409, detail=f"Scraper already running on this instance (job {e.job_id})")
+    return {"jobId": job.id, "status": job.status, "statusUrl": f"/jobs/{job.id}"}
+
+
+async def _run_scraper(job: Job, force: bool = False) -> dict:
     """
-    ✅ 실시간 모니터링형 자동 수집기 (with DynamoDB Lock)
+    ✅ 실시간 모니터링형 자동 수집기 (수집처별 DynamoDB 리스)
     - SourceMetaTable 기준으로 각 수집처 1회 스캔
     - 목록 selector / 본문 selector 둘 다 테이블에서 지정
-    - 이미 등록된 URL은 제외
+    - 이미 등록된 URL은 제외 (ArticleUrlTable 인덱스 + Bloom 필터)
     - 신규 기사만 ArticleTable에 저장
     - 페이징 없음
-    - 중복 실행 방지 (DynamoDB Lock)
+    - 수집처/기사 페이지를 동시에 수집 (전체 + 호스트별 동시성 제한)
+    - 목록 페이지 조건부 요청 (ETag/Last-Modified/목록 지문) → 변경 없는 수집처 생략
+      (force=true 면 무시하고 전체 수집)
+    - 수집처별 적응형 주기: 새 기사가 없으면 주기를 늘리고(지수 백오프) 자주 올라오면 좁힘
+      (force=false 면 nextDueAt 이 지난 수집처만)
+    - 중복 수집 방지: 수집처마다 리스(조건부 쓰기 + heartbeat)를 잡은 인스턴스만 수집
+      → 여러 인스턴스가 동시에 실행하면 수집처를 나눠 가짐, 죽은 인스턴스의 리스는 만료 후 회수
     """
-
-    # ✅ 1. 실행 중인지 확인
     try:
-        lock_item = lock_table.get_item(Key={"PK": "scrap-lock"}).get("Item")
-        if lock_item and lock_item.get("isRunning"):
-            raise HTTPException(status_code=409, detail="Scraper already running")
-
-        # ✅ 2. 락 설정
-        lock_table.put_item(
-            Item={
-                "PK": "scrap-lock",
-                "isRunning": True,
-                "startedAt": datetime.utcnow().isoformat(),
-            }
-        )
-
         print("🚀 수집기 실행 시작")
 
-        # ✅ 3. 실제 수집 로직
-        res = source_table.scan()
-        sources = res.get("Items", [])
+        sources = [src async for src in source_repo.scan_all()]
         if not sources:
             raise HTTPException(status_code=404, detail="No sources found")
 
+        all_count = len(sources)
+        if not force:
+            sources = [src for src in sources if is_due(src)]
+        job.bump(field="notDue", n=all_count - len(sources))
+
+        summaries = await _crawl_all(sources, force, job)
+        invalidate_sources()   # 목록 조건부 요청 상태(listingEtag 등)가 갱신됨
+
         total_new = 0
         total_skipped = 0
         total_failed = 0
+        total_gave_up = 0
+        total_leased = 0
         result_summary = []
 
-        for src in sources:
-            src_id = src["sourceId"]
-            src_name = src["srcName"]
-            base_url = src["sourceUrl"]
-            selector_container = src.get("selectorContainer")
-            selector_item = src.get("selectorItem", "a")
-            selector_content = src.get("contentSelector")
-            category = src.get("category", "General")
-
-            print(f"🕷️ {src_name} ({src_id}) → {base_url}")
-
-            try:
-                links = extract_links(base_url, selector_container, selector_item)
-            except Exception as e:
-                print(f"⚠️ [{src_name}] 링크 추출 실패: {e}")
+        for summary in summaries:
+            if summary is None:
+                # 링크 추출 실패
                 total_failed += 1
                 continue
-
-            new_count = 0
-            skip_count = 0
-            fail_count = 0
-
-            for link in links:
-                # URL 정규화
-                if link.startswith("/"):
-                    full_url = base_url.rstrip("/") + link
-                elif link.startswith("http"):
-                    full_url = link
-                else:
-                    full_url = f"{base_url.rstrip('/')}/{link}"
-
-                # 중복 확인
-                exists = article_table.scan(
-                    FilterExpression="articleUrl = :u",
-                    ExpressionAttributeValues={":u": full_url}
-                )
-                if exists.get("Items"):
-                    skip_count += 1
-                    continue
-
-                try:
-                    # ✅ 본문 selector를 동적으로 전달
-                    data = get_contents(full_url, selector_content)
-                    html = data.get("html", "")
-                    imgs = data.get("images", [])
-                    image_url = imgs[0]["src"] if imgs else None
-
-                    article_id = f"{src_id}-{uuid.uuid4().hex[:10]}"
-
-                    article_table.put_item(
-                        Item={
-                            "articleId": article_id,
-                            "sourceId": src_id,
-                            "articleUrl": full_url,
-                            "content": html,
-                            "imageUrl": image_url,
-                            "date": datetime.utcnow().isoformat(),
-                            "category": category,
-                            "contentSelector": selector_content,
-                        }
-                    )
-
-                    new_count += 1
-                    total_new += 1
-
-                except Exception as e:
-                    print(f"⚠️ [{src_name}] {full_url} 수집 실패: {e}")
-                    fail_count += 1
-                    total_failed += 1
-
-            result_summary.append({
-                "sourceId": src_id,
-                "sourceName": src_name,
-                "checkedLinks": len(links),
-                "newArticles": new_count,
-                "skipped": skip_count,
-                "failed": fail_count,
-            })
-            total_skipped += skip_count
+            result_summary.append(summary)
+            total_new += summary["newArticles"]
+            total_skipped += summary["skipped"]
+            total_failed += summary["failed"]
+            total_gave_up += summary["gaveUp"]
+            total_leased += summary["listingStatus"] == "leased"
 
         return {
             "status": "ok",
@@ -141,6 +436,9 @@ def run_scraper():
             "totalNew": total_new,
             "totalSkipped": total_skipped,
             "totalFailed": total_failed,
+            "totalGaveUp": total_gave_up,   # 반복 실패로 수집을 포기한 기사 URL 수
+            "totalLeased": total_leased,   # 다른 인스턴스가 수집 중이라 건너뛴 수집처 수
+            "totalNotDue": all_count - len(sources),   # 수집 주기가 아직 안 된 수집처 수
             "summary": result_summary,
         }
 
@@ -149,17 +447,3 @@ def run_scraper():
     except Exception as e:
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
-
-    finally:
-        # ✅ 4. 락 해제 (예외 발생 여부와 상관없이)
-        try:
-            lock_table.put_item(
-                Item={
-                    "PK": "scrap-lock",
-                    "isRunning": False,
-                    "finishedAt": datetime.utcnow().isoformat(),
-                }
-            )
-            print("✅ 락 해제 완료")
-        except Exception as unlock_err:
-            print(f"⚠️ 락 해제 실패: {unlock_err}")
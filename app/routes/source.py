@@ -1,17 +1,17 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Request
 from pydantic import BaseModel
-import boto3
 from boto3.dynamodb.conditions import Attr
 import uuid
+from typing import Optional
+from app.modules.repository import articles as article_repo, sources as source_repo
+from app.modules.body_store import article_bodies
+from app.modules.dynamo_scan import select_fields
+from app.modules.response_cache import SOURCES, invalidate_sources, response_cache
 
 router = APIRouter(prefix="/sources", tags=["Sources"])
 
-# DynamoDB
-region = "us-east-1"
-dynamodb = boto3.resource("dynamodb", region_name=region)
-source_table = dynamodb.Table("SourceMetaTable")
-article_table = dynamodb.Table("ArticleTable")
-
+# /{source_id}/articles?view=summary (본문 제외)
+ARTICLE_SUMMARY_FIELDS = ("articleId", "sourceId", "articleUrl", "date", "imageUrl", "category", "generateFlag")
 
 # -------------------------------
 # ✅ Pydantic 모델
@@ -24,6 +24,7 @@ class SourceBase(BaseModel):
     selectorItem: str
     contentSelector: str  # ✅ 추가됨
     category: str
+    contentEarlyStop: bool = False  # 본문 요소가 닫히면 나머지 페이지 다운로드 중단
 
 
 class SourceUpdate(SourceBase):
@@ -35,29 +36,33 @@ class SourceUpdate(SourceBase):
 # -------------------------------
 
 @router.get("")
-def get_all_sources():
-    """모든 수집처 목록 조회"""
+async def get_all_sources(request: Request):
+    """모든 수집처 목록 조회 (응답 캐시 + ETag, 수집처 변경 시 무효화)"""
     try:
-        res = source_table.scan()
-        return {"count": len(res["Items"]), "items": res["Items"]}
+        async def load():
+            items = [item async for item in source_repo.scan_all()]
+            return {"count": len(items), "items": items}, None
+
+        cached = await response_cache.aget_or_load(SOURCES, "all", load)
+        return cached.to_response(request)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{source_id}")
-def get_source(source_id: str):
+async def get_source(source_id: str):
     """단일 수집처 조회"""
     try:
-        res = source_table.get_item(Key={"sourceId": source_id})
-        if "Item" not in res:
+        item = await source_repo.get({"sourceId": source_id})
+        if item is None:
             raise HTTPException(status_code=404, detail="Source not found")
-        return res["Item"]
+        return item
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post("")
-def create_source(src: SourceBase):
+async def create_source(src: SourceBase):
     """새로운 수집처 추가"""
     try:
         source_id = f"SRC-{uuid.uuid4().hex[:8]}"
@@ -71,9 +76,11 @@ def create_source(src: SourceBase):
             "selectorItem": src.selectorItem,
             "contentSelector": src.contentSelector,  # ✅ 추가됨
             "category": src.category,
+            "contentEarlyStop": src.contentEarlyStop,
         }
 
-        source_table.put_item(Item=item)
+        await source_repo.put(item)
+        invalidate_sources()
         return {"message": "Created successfully", "sourceId": source_id}
 
     except Exception as e:
@@ -81,8 +88,8 @@ def create_source(src: SourceBase):
 
 
 @router.put("/{source_id}")
-def update_source(source_id: str, data: SourceUpdate):
-    """기존 수집처 정보 수정"""
+async def update_source(source_id: str, data: SourceUpdate):
+    """기존 수집처 정보 수정 (수집 설정이 바뀌므로 목록 조건부 요청 상태 초기화 + 다음 실행에서 바로 수집)"""
     try:
         update_expr = """
         SET srcName=:n,
@@ -91,7 +98,9 @@ def update_source(source_id: str, data: SourceUpdate):
             selectorContainer=:c,
             selectorItem=:i,
             contentSelector=:s,
-            category=:g
+            category=:g,
+            contentEarlyStop=:x
+        REMOVE listingEtag, listingLastModified, listingFingerprint, nextDueAt
         """
 
         values = {
@@ -102,13 +111,15 @@ def update_source(source_id: str, data: SourceUpdate):
             ":i": data.selectorItem,
             ":s": data.contentSelector,  # ✅ 추가됨
             ":g": data.category,
+            ":x": data.contentEarlyStop,
         }
 
-        source_table.update_item(
-            Key={"sourceId": source_id},
+        await source_repo.update(
+            {"sourceId": source_id},
             UpdateExpression=update_expr,
             ExpressionAttributeValues=values,
         )
+        invalidate_sources()
 
         return {"message": "Updated successfully", "sourceId": source_id}
 
@@ -117,21 +128,34 @@ def update_source(source_id: str, data: SourceUpdate):
 
 
 @router.delete("/{source_id}")
-def delete_source(source_id: str):
+async def delete_source(source_id: str):
     """수집처 삭제"""
     try:
-        source_table.delete_item(Key={"sourceId": source_id})
+        await source_repo.delete({"sourceId": source_id})
+        invalidate_sources()
         return {"message": "Deleted successfully", "sourceId": source_id}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/{source_id}/articles")
-def get_articles_by_source(source_id: str):
-    """특정 수집처의 기사 목록 조회"""
+async def get_articles_by_source(
+    source_id: str,
+    fields: Optional[str] = Query(None, description="가져올 속성 (쉼표 구분, articleId 는 항상 포함)"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: 본문 제외 목록용 속성만"),
+):
+    """
+    특정 수집처의 기사 목록 조회
+    - fields= / view=summary: ProjectionExpression 으로 필요한 속성만 반환
+      (스캔 RCU 는 필터/프로젝션 전 아이템 크기로 계산되므로 줄어드는 것은 전송량)
+    """
     try:
-        res = article_table.scan(FilterExpression=Attr("sourceId").eq(source_id))
-        items = res.get("Items", [])
+        selected = select_fields(fields, view, ARTICLE_SUMMARY_FIELDS, keys=["articleId"])
+        items = [item async for item in article_repo.scan_all(
+            projection=article_bodies.projection(selected),
+            FilterExpression=Attr("sourceId").eq(source_id),
+        )]
+        items = await article_bodies.aunpack_all(items)
         return {"count": len(items), "items": items}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,59 @@
+"""
+본문 추출 엔진 벤치마크 (BeautifulSoup html.parser vs lxml 단일 순회)
+
+사용법:
+    python -m benchmarks.bench_extract --selector "div.sm-section-inner" URL_or_FILE [...]
+"""
+import argparse
+import os
+import statistics
+import time
+
+from app.modules.crawling import HAS_LXML, extract_contents
+from app.modules.http_transport import get_transport
+
+
+def load_page(target: str) -> str:
+    """URL 이면 다운로드, 아니면 로컬 HTML 파일 읽기"""
+    if os.path.exists(target):
+        with open(target, "r", encoding="utf-8") as f:
+            return f.read()
+    response = get_transport().get(target)
+    response.raise_for_status()
+    return response.text
+
+
+def bench(text: str, selector: str, engine: str, repeat: int) -> tuple:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = extract_contents(text, selector, engine=engine)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="+", help="기사 URL 또는 저장된 HTML 파일")
+    parser.add_argument("--selector", required=True, help="본문 CSS selector (contentSelector)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not HAS_LXML:
+        raise SystemExit("lxml / cssselect 가 설치되어 있지 않습니다.")
+
+    print(f"{'page':<60} {'size':>9} {'bs4 ms':>9} {'lxml ms':>9} {'speedup':>8} {'images':>7}")
+    for target in args.targets:
+        text = load_page(target)
+        bs4_time, bs4_result = bench(text, args.selector, "bs4", args.repeat)
+        lxml_time, lxml_result = bench(text, args.selector, "lxml", args.repeat)
+        same_images = "same" if bs4_result["images"] == lxml_result["images"] else "DIFF"
+        print(
+            f"{target[-60:]:<60} {len(text):>9} {bs4_time * 1000:>9.1f} {lxml_time * 1000:>9.1f} "
+            f"{bs4_time / lxml_time:>7.1f}x {same_images:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,91 @@
-import boto3
-from datetime import datetime
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from app.modules.url_index import URL_INDEX_TABLE, url_hash
+from app.modules.generation_cache import GENERATION_CACHE_TABLE
+from app.modules.leases import SCRAP_LEASE_TABLE
+from app.modules.body_store import BODY_BUCKET
+from app.modules.jobs import JOB_TABLE
+from app.modules.aws_clients import get_client, get_resource
 
 # ✅ DynamoDB 클라이언트/리소스 초기화
-dynamodb = boto3.resource("dynamodb", region_name="us-east-1")
-client = boto3.client("dynamodb", region_name="us-east-1")
+# (AWS_ENDPOINT_URL 지정 시 DynamoDB Local / moto 서버에 생성)
+dynamodb = get_resource("dynamodb")
+client = get_client("dynamodb")
+
+
+# ✅ NewsTable GSI 정의 (인덱스명, 파티션키, 정렬키)
+NEWS_INDEXES = [
+    ("CategoryPubDateIndex", "category", "pubDate"),   # /news/category/{category}
+    ("PubDayPubDateIndex", "pubDay", "pubDate"),       # RSS (KST 일자별)
+]
+
+
+def gsi_definition(index_name: str, hash_key: str, range_key: str) -> dict:
+    return {
+        "IndexName": index_name,
+        "KeySchema": [
+            {"AttributeName": hash_key, "KeyType": "HASH"},
+            {"AttributeName": range_key, "KeyType": "RANGE"},
+        ],
+        "Projection": {"ProjectionType": "ALL"},
+    }
+
+
+def gsi_attribute_definitions(indexes) -> list:
+    names = dict.fromkeys(name for _, h, r in indexes for name in (h, r))
+    return [{"AttributeName": name, "AttributeType": "S"} for name in names]
+
+
+# ✅ 기존 테이블에 없는 GSI 추가 (데이터 유지, 테이블 재생성 없이)
+def ensure_news_indexes():
+    desc = client.describe_table(TableName="NewsTable")["Table"]
+    existing = {idx["IndexName"] for idx in desc.get("GlobalSecondaryIndexes", [])}
+    for index_name, hash_key, range_key in NEWS_INDEXES:
+        if index_name in existing:
+            print(f"✅ GSI '{index_name}' already exists.")
+            continue
+        # DynamoDB는 update_table 1회에 GSI 1개만 생성 가능 → 하나씩 생성 후 대기
+        client.update_table(
+            TableName="NewsTable",
+            AttributeDefinitions=gsi_attribute_definitions([(index_name, hash_key, range_key)]),
+            GlobalSecondaryIndexUpdates=[{"Create": gsi_definition(index_name, hash_key, range_key)}],
+        )
+        print(f"🆕 Creating GSI '{index_name}' ... (백필 완료까지 시간이 걸릴 수 있음)")
+        waiter = client.get_waiter("table_exists")
+        while True:
+            waiter.wait(TableName="NewsTable")
+            indexes = client.describe_table(TableName="NewsTable")["Table"].get("GlobalSecondaryIndexes", [])
+            status = next(idx["IndexStatus"] for idx in indexes if idx["IndexName"] == index_name)
+            if status == "ACTIVE":
+                break
+            time.sleep(10)
+        print(f"✅ GSI '{index_name}' is active.")
+
+
+# ✅ pubDay(KST 일자) 속성이 없는 기존 뉴스 채우기 (PubDayPubDateIndex 도입 이전 데이터용)
+def backfill_pub_day():
+    from app.modules.dynamo_scan import scan_all
+
+    kst = timezone(timedelta(hours=9))
+    news_table = dynamodb.Table("NewsTable")
+    count = 0
+    for item in scan_all(news_table, projection=["articleId", "pubDate", "pubDay"]):
+        if item.get("pubDay") or not item.get("pubDate"):
+            continue
+        try:
+            pub_dt = datetime.fromisoformat(item["pubDate"].replace("Z", "+00:00"))
+        except ValueError:
+            continue
+        if pub_dt.tzinfo is None:
+            pub_dt = pub_dt.replace(tzinfo=timezone.utc)   # 기존 데이터는 UTC 기준으로 저장됨
+        news_table.update_item(
+            Key={"articleId": item["articleId"]},
+            UpdateExpression="SET pubDay = :d",
+            ExpressionAttributeValues={":d": pub_dt.astimezone(kst).strftime("%Y-%m-%d")},
+        )
+        count += 1
+    print(f"✅ pubDay backfilled: {count} items")
 
 
 # ✅ 테이블이 존재하면 삭제
@@ -24,6 +106,10 @@ def create_tables():
     delete_table_if_exists("SourceMetaTable")
     delete_table_if_exists("ArticleTable")
     delete_table_if_exists("NewsTable")
+    delete_table_if_exists(URL_INDEX_TABLE)
+    delete_table_if_exists(GENERATION_CACHE_TABLE)
+    delete_table_if_exists(SCRAP_LEASE_TABLE)
+    delete_table_if_exists(JOB_TABLE)
 
     # --- 1️⃣ SourceMetaTable ---
     table_sources = dynamodb.create_table(
@@ -53,24 +139,113 @@ def create_tables():
         KeySchema=[{"AttributeName": "articleId", "KeyType": "HASH"}],
         AttributeDefinitions=[
             {"AttributeName": "articleId", "AttributeType": "S"},
+            *gsi_attribute_definitions(NEWS_INDEXES),
         ],
+        GlobalSecondaryIndexes=[gsi_definition(*idx) for idx in NEWS_INDEXES],
         BillingMode="PAY_PER_REQUEST",
     )
     print("🆕 Created table: NewsTable")
 
+    # --- 4️⃣ ArticleUrlTable (기사 URL 중복 확인 인덱스) ---
+    table_url_index = dynamodb.create_table(
+        TableName=URL_INDEX_TABLE,
+        KeySchema=[{"AttributeName": "urlHash", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "urlHash", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    print(f"🆕 Created table: {URL_INDEX_TABLE}")
+
+    # --- 5️⃣ GenerationCacheTable (본문 해시 기반 생성 결과 캐시) ---
+    table_generation_cache = dynamodb.create_table(
+        TableName=GENERATION_CACHE_TABLE,
+        KeySchema=[{"AttributeName": "cacheKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "cacheKey", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    print(f"🆕 Created table: {GENERATION_CACHE_TABLE}")
+
+    # --- 6️⃣ ScrapLeaseTable (수집처별 수집 리스, 만료된 리스는 TTL 로 정리) ---
+    table_scrap_lease = dynamodb.create_table(
+        TableName=SCRAP_LEASE_TABLE,
+        KeySchema=[{"AttributeName": "leaseKey", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "leaseKey", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    print(f"🆕 Created table: {SCRAP_LEASE_TABLE}")
+
+    # --- 7️⃣ JobTable (백그라운드 작업 상태, 인스턴스 간 공유 / 완료 후 TTL 로 정리) ---
+    table_jobs = dynamodb.create_table(
+        TableName=JOB_TABLE,
+        KeySchema=[{"AttributeName": "jobId", "KeyType": "HASH"}],
+        AttributeDefinitions=[
+            {"AttributeName": "jobId", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    print(f"🆕 Created table: {JOB_TABLE}")
+
     # --- 생성 완료 대기 ---
     print("⏳ Waiting for tables to become active...")
     table_sources.wait_until_exists()
     table_articles.wait_until_exists()
     table_news.wait_until_exists()
+    table_url_index.wait_until_exists()
+    table_generation_cache.wait_until_exists()
+    table_scrap_lease.wait_until_exists()
+    table_jobs.wait_until_exists()
     print("✅ All tables are active!")
 
+    # 만료된 캐시 항목 / 리스 / 작업 기록은 DynamoDB TTL로 자동 삭제
+    for table_name in (GENERATION_CACHE_TABLE, SCRAP_LEASE_TABLE, JOB_TABLE):
+        client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={"Enabled": True, "AttributeName": "expiresAt"},
+        )
+
+
+# ✅ 본문 오프로드 버킷 (비공개) 생성
+def ensure_body_bucket():
+    s3 = get_client("s3")
+    try:
+        s3.head_bucket(Bucket=BODY_BUCKET)
+        print(f"✅ Bucket exists: {BODY_BUCKET}")
+    except s3.exceptions.ClientError:
+        kwargs = {}
+        if s3.meta.region_name != "us-east-1":
+            kwargs["CreateBucketConfiguration"] = {"LocationConstraint": s3.meta.region_name}
+        s3.create_bucket(Bucket=BODY_BUCKET, **kwargs)
+        print(f"🆕 Created bucket: {BODY_BUCKET}")
+
+    # 퍼블릭 액세스 전부 차단 + 기본 암호화 (SSE-S3)
+    s3.put_public_access_block(
+        Bucket=BODY_BUCKET,
+        PublicAccessBlockConfiguration={
+            "BlockPublicAcls": True,
+            "IgnorePublicAcls": True,
+            "BlockPublicPolicy": True,
+            "RestrictPublicBuckets": True,
+        },
+    )
+    s3.put_bucket_encryption(
+        Bucket=BODY_BUCKET,
+        ServerSideEncryptionConfiguration={
+            "Rules": [{"ApplyServerSideEncryptionByDefault": {"SSEAlgorithm": "AES256"}}],
+        },
+    )
+
 
 # ✅ 샘플 데이터 삽입
 def insert_sample_data():
     sources_table = dynamodb.Table("SourceMetaTable")
     articles_table = dynamodb.Table("ArticleTable")
     news_table = dynamodb.Table("NewsTable")
+    url_index_table = dynamodb.Table(URL_INDEX_TABLE)
 
     # --- 수집처 메타 ---
     source_item = {
@@ -102,6 +277,7 @@ def insert_sample_data():
         "title": "여기 뉴스 기사 형식으로 작성해 드렸습니다:",
         "author": "System",
         "pubDate": datetime.utcnow().isoformat(),
+        "pubDay": datetime.now(timezone(timedelta(hours=9))).strftime("%Y-%m-%d"),
         "description": "AI가 자동으로 작성한 뉴스입니다.",
         "sourceArticleId": "ENT-0001-251002-001",
     }
@@ -109,11 +285,27 @@ def insert_sample_data():
     sources_table.put_item(Item=source_item)
     articles_table.put_item(Item=article_item)
     news_table.put_item(Item=news_item)
+    url_index_table.put_item(Item={
+        "urlHash": url_hash(article_item["articleUrl"]),
+        "articleUrl": article_item["articleUrl"],
+        "articleId": article_item["articleId"],
+    })
     print("✅ Sample data inserted successfully.")
 
 
 # ✅ 실행 엔트리포인트
+#   python seed.py          → 전체 테이블 재생성 + 샘플 데이터
+#   python seed.py indexes  → 기존 NewsTable에 GSI만 추가 + pubDay 백필
+#   python seed.py buckets  → 본문 오프로드 버킷만 생성
 if __name__ == "__main__":
+    if sys.argv[1:] == ["indexes"]:
+        ensure_news_indexes()
+        backfill_pub_day()
+        sys.exit(0)
+    if sys.argv[1:] == ["buckets"]:
+        ensure_body_bucket()
+        sys.exit(0)
     create_tables()
+    ensure_body_bucket()
     insert_sample_data()
     print("🎉 DynamoDB setup completed successfully!")